@@ -0,0 +1,57 @@
+"""
+Shared fixtures for the live-service tests (test_drive.py, test_extractors.py,
+test_indexer.py). Session-scoped so OAuth, the Drive listing and the
+Elasticsearch connection happen once per pytest run, not once per script.
+Tests needing a service that isn't available are skipped; the offline tests
+in the same files still run.
+"""
+import sys
+from pathlib import Path
+from typing import List
+
+import pytest
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from search_service.cloud.base_client import CloudFile
+from search_service.cloud.drive_client import DriveClient
+from search_service.extractor.extractor_factory import ExtractorFactory
+from search_service.indexer.elastic_indexer import ElasticIndexer
+from search_service.config import settings
+
+# test_api.py exercises a running API server - run it directly
+collect_ignore = ["test_api.py"]
+
+
+@pytest.fixture(scope="session")
+def drive_client() -> DriveClient:
+    """Drive client, authenticated once per session"""
+    if not Path(settings.token_file).exists():
+        pytest.skip(f"No Drive token at {settings.token_file} (run a sync once to authorize)")
+    
+    client = DriveClient()
+    assert client.authenticate(interactive=False), "Authentication with Google Drive failed"
+    return client
+
+
+@pytest.fixture(scope="session")
+def drive_files(drive_client: DriveClient) -> List[CloudFile]:
+    """All files in the configured Drive folder, listed once per session"""
+    return list(drive_client.list_files())
+
+
+@pytest.fixture(scope="session")
+def extractor_factory() -> ExtractorFactory:
+    """Extractor factory without OCR or a cache, so every file is really parsed"""
+    return ExtractorFactory(include_ocr=False)
+
+
+@pytest.fixture(scope="session")
+def indexer() -> ElasticIndexer:
+    """Connected Elasticsearch indexer with the index created"""
+    indexer = ElasticIndexer()
+    if not indexer.connect():
+        pytest.skip("Elasticsearch is not reachable (docker compose up -d)")
+    assert indexer.create_index(), "Failed to create index"
+    return indexer
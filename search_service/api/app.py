@@ -2,24 +2,54 @@
 FastAPI application for document search service.
 Provides REST API endpoints for searching indexed documents.
 """
+import asyncio
+import hashlib
 import logging
+import secrets
 from typing import List, Optional
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, Query, HTTPException
+import orjson
+from cachetools import TTLCache
+from fastapi import BackgroundTasks, Depends, FastAPI, Query, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from pydantic import BaseModel, Field
 
-from ..indexer.elastic_indexer import ElasticIndexer
+from ..indexer.elastic_indexer import ElasticIndexer, SearchError
 from ..config import settings
+from .search_batcher import SearchBatcher
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Settings read on every request, resolved once at import
+ES_INDEX = settings.elasticsearch_index
+ES_HOST = settings.elasticsearch_host
+SEARCH_CACHE_CONTROL = f"public, max-age={settings.search_http_max_age}"
+
 # Global indexer instance
 indexer: Optional[ElasticIndexer] = None
 
+# Coalesces concurrent searches into _msearch requests
+batcher: Optional[SearchBatcher] = None
+
+# Set while a background reindex is running
+reindex_running = False
+
+# In-process result cache keyed on (normalized query, limit)
+search_cache: TTLCache = TTLCache(
+    maxsize=settings.search_cache_size,
+    ttl=settings.search_cache_ttl
+)
+search_cache_lock = asyncio.Lock()
+
+# Reads the admin token from "Authorization: Bearer <token>"
+admin_bearer = HTTPBearer(auto_error=False)
+
 
 # Pydantic models for API responses
 class SearchResult(BaseModel):
@@ -57,7 +87,7 @@ class ErrorResponse(BaseModel):
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Manage application lifespan"""
-    global indexer
+    global indexer, batcher
     
     # Startup: Connect to Elasticsearch
     logger.info("Starting up Document Search Service...")
@@ -69,6 +99,13 @@ async def lifespan(app: FastAPI):
         # Ensure index exists
         if not indexer.create_index():
             logger.warning("Index already exists or creation failed")
+        
+        batcher = SearchBatcher(
+            indexer,
+            max_batch=settings.search_batch_size,
+            max_wait_ms=settings.search_batch_wait_ms
+        )
+        batcher.start()
     else:
         logger.error("Failed to connect to Elasticsearch")
         logger.error("Make sure Elasticsearch is running: docker compose up -d")
@@ -77,6 +114,8 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("Shutting down Document Search Service...")
+    if batcher:
+        await batcher.stop()
 
 
 # Create FastAPI app
@@ -84,7 +123,8 @@ app = FastAPI(
     title="Document Search API",
     description="Search documents from Google Drive indexed in Elasticsearch",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # Add CORS middleware
@@ -96,6 +136,57 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress larger responses (search results with highlights)
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
+
+def require_admin(credentials: Optional[HTTPAuthorizationCredentials] = Depends(admin_bearer)):
+    """Reject requests without the configured admin token"""
+    if not settings.admin_token:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled (ADMIN_TOKEN not set)")
+    
+    if credentials is None or not secrets.compare_digest(
+        credentials.credentials.encode(), settings.admin_token.encode()
+    ):
+        raise HTTPException(
+            status_code=401,
+            detail="Invalid or missing admin token",
+            headers={"WWW-Authenticate": "Bearer"}
+        )
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag (RFC 9110 13.1.2)"""
+    if not if_none_match:
+        return False
+    
+    opaque_tag = etag.removeprefix("W/")
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == opaque_tag:
+            return True
+    return False
+
+
+def cacheable_json_response(request: Request, content: dict) -> Response:
+    """
+    Serialize content with a weak ETag and Cache-Control header.
+    Returns 304 Not Modified when the client already has this body.
+    The ETag is weak because GZipMiddleware may compress the body after it
+    is set, and a strong ETag must differ between content codings.
+    """
+    body = orjson.dumps(content)
+    etag = f'W/"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": SEARCH_CACHE_CONTROL
+    }
+    
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    
+    return Response(content=body, media_type="application/json", headers=headers)
+
 
 @app.get("/", summary="Root endpoint")
 async def root():
@@ -120,7 +211,7 @@ async def health_check():
         return HealthResponse(
             status="error",
             elasticsearch_connected=False,
-            index_name=settings.elasticsearch_index
+            index_name=ES_INDEX
         )
     
     # Test Elasticsearch connection
@@ -136,7 +227,7 @@ async def health_check():
     return HealthResponse(
         status=status,
         elasticsearch_connected=es_connected,
-        index_name=settings.elasticsearch_index
+        index_name=ES_INDEX
     )
 
 
@@ -146,11 +237,14 @@ async def health_check():
     summary="Search documents",
     responses={
         200: {"description": "Search results"},
+        304: {"description": "Results unchanged since the ETag in If-None-Match"},
         400: {"model": ErrorResponse, "description": "Bad request"},
-        500: {"model": ErrorResponse, "description": "Internal server error"}
+        500: {"model": ErrorResponse, "description": "Internal server error"},
+        503: {"model": ErrorResponse, "description": "Elasticsearch unavailable"}
     }
 )
 async def search_documents(
+    request: Request,
     q: str = Query(..., description="Search query", min_length=1),
     limit: int = Query(10, description="Maximum number of results", ge=1, le=100)
 ):
@@ -161,20 +255,35 @@ async def search_documents(
     - **limit**: Maximum number of results to return (default: 10, max: 100)
     
     Returns a list of matching documents with relevance scores and highlighted snippets.
+    Responses carry an ETag; send it back in If-None-Match to get 304 Not Modified.
     """
-    if not indexer:
+    if not indexer or not batcher:
         raise HTTPException(
-            status_code=500,
+            status_code=503,
             detail="Search service not initialized. Elasticsearch connection failed."
         )
     
+    cache_key = (q.lower().strip(), limit)
+    
+    async with search_cache_lock:
+        cached = search_cache.get(cache_key)
+    
+    if cached is not None:
+        response = SearchResponse.model_construct(
+            query=q,
+            total_results=len(cached),
+            results=cached
+        )
+        return cacheable_json_response(request, response.model_dump())
+    
     try:
-        # Perform search
-        results = indexer.search(query=q, limit=limit)
+        # Perform search (batched with concurrent requests).
+        # Failures raise - only real results reach the cache below
+        results = await batcher.submit(q, limit)
         
-        # Convert to response model
+        # Convert to response model - ES data is trusted, skip validation
         search_results = [
-            SearchResult(
+            SearchResult.model_construct(
                 file_name=result['file_name'],
                 file_path=result['file_path'],
                 url=result['url'],
@@ -186,12 +295,22 @@ async def search_documents(
             for result in results
         ]
         
-        return SearchResponse(
+        async with search_cache_lock:
+            search_cache[cache_key] = search_results
+        
+        response = SearchResponse.model_construct(
             query=q,
             total_results=len(search_results),
             results=search_results
         )
+        return cacheable_json_response(request, response.model_dump())
         
+    except SearchError as e:
+        logger.error(f"Search failed: {e}")
+        raise HTTPException(
+            status_code=503,
+            detail=f"Search backend unavailable: {str(e)}"
+        )
     except Exception as e:
         logger.error(f"Search failed: {e}", exc_info=True)
         raise HTTPException(
@@ -200,6 +319,76 @@ async def search_documents(
         )
 
 
+@app.post("/cache/invalidate", summary="Clear search cache", dependencies=[Depends(require_admin)])
+async def invalidate_cache():
+    """
+    Clear the in-process search result cache.
+    Call after re-indexing to make new documents visible before the TTL expires.
+    Requires the admin token.
+    """
+    async with search_cache_lock:
+        cleared = len(search_cache)
+        search_cache.clear()
+    
+    logger.info(f"Cleared {cleared} cached search results")
+    return {"cleared": cleared}
+
+
+def run_sync(incremental: bool):
+    """Run the Drive sync pipeline (blocking)"""
+    # Imported here so Google Drive libraries only load when a reindex is requested
+    from ..main import DocumentIndexer
+    
+    pipeline = DocumentIndexer(incremental=incremental)
+    # No browser in a server process: without a usable token.json, fail fast
+    if not pipeline.connect(interactive=False):
+        logger.error("Reindex aborted: could not connect to Elasticsearch or Google Drive")
+        return
+    
+    pipeline.sync()
+    pipeline.print_summary()
+
+
+async def run_reindex(incremental: bool):
+    """Run a sync off the event loop, then drop stale cached results"""
+    global reindex_running
+    
+    try:
+        await asyncio.to_thread(run_sync, incremental)
+        async with search_cache_lock:
+            search_cache.clear()
+    except Exception as e:
+        logger.error(f"Reindex failed: {e}", exc_info=True)
+    finally:
+        reindex_running = False
+
+
+@app.post(
+    "/admin/reindex",
+    status_code=202,
+    summary="Sync Google Drive into the index",
+    dependencies=[Depends(require_admin)]
+)
+async def reindex(
+    background_tasks: BackgroundTasks,
+    incremental: bool = Query(True, description="Only index new/modified files")
+):
+    """
+    Start a Google Drive sync in the background.
+    Drive authentication happens here rather than at startup, so the search
+    path never waits on it. Requires the admin token and an existing OAuth
+    token (token.json) - the sync fails instead of starting a browser login.
+    """
+    global reindex_running
+    
+    if reindex_running:
+        raise HTTPException(status_code=409, detail="Reindex already running")
+    
+    reindex_running = True
+    background_tasks.add_task(run_reindex, incremental)
+    return {"status": "started", "incremental": incremental}
+
+
 @app.get("/stats", summary="Index statistics")
 async def get_stats():
     """
@@ -213,13 +402,13 @@ async def get_stats():
         )
     
     try:
-        # Get all document IDs
-        doc_ids = indexer.get_all_document_ids()
+        # Count via _count - no need to pull every document ID
+        total = indexer.count_documents()
         
         return {
-            "total_documents": len(doc_ids),
-            "index_name": settings.elasticsearch_index,
-            "elasticsearch_host": settings.elasticsearch_host
+            "total_documents": total,
+            "index_name": ES_INDEX,
+            "elasticsearch_host": ES_HOST
         }
         
     except Exception as e:
@@ -233,11 +422,14 @@ async def get_stats():
 if __name__ == "__main__":
     import uvicorn
     
-    # Run the API server
+    # Run the API server on uvloop + httptools (bundled with uvicorn[standard])
     uvicorn.run(
         "search_service.api.app:app",
         host=settings.api_host,
         port=settings.api_port,
-        reload=True,
+        reload=settings.api_reload,
+        loop="uvloop",
+        http="httptools",
+        access_log=settings.api_access_log,
         log_level="info"
     )
@@ -0,0 +1,28 @@
+"""
+Gunicorn configuration for production deployments.
+Runs the FastAPI app in multiple Uvicorn worker processes.
+
+Usage:
+    gunicorn search_service.api.app:app -c search_service/api/gunicorn_conf.py
+
+Each worker runs the app lifespan on its own, so every process gets its
+own Elasticsearch client and connection pool.
+"""
+import os
+
+from search_service.config import settings
+
+# Bind address
+bind = os.getenv("BIND", f"{settings.api_host}:{settings.api_port}")
+
+# Worker processes: 2N+1 by default, override with WEB_CONCURRENCY
+workers = int(os.getenv("WEB_CONCURRENCY", 2 * (os.cpu_count() or 1) + 1))
+worker_class = "uvicorn.workers.UvicornWorker"
+
+# Keep client connections open between requests
+keepalive = 75
+
+# Logging
+loglevel = os.getenv("LOG_LEVEL", "info")
+accesslog = "-" if settings.api_access_log else None
+errorlog = "-"
@@ -0,0 +1,118 @@
+"""
+Search request coalescing for the API.
+Buffers concurrent /search calls and sends them to Elasticsearch as one _msearch.
+"""
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..indexer.elastic_indexer import ElasticIndexer
+
+logger = logging.getLogger(__name__)
+
+
+class SearchBatcher:
+    """Collects searches arriving within a short window into a single msearch"""
+    
+    def __init__(self, indexer: ElasticIndexer, max_batch: int = 32, max_wait_ms: float = 5):
+        """
+        Initialize the batcher.
+        
+        Args:
+            indexer: Connected indexer used to run the batched searches
+            max_batch: Maximum number of searches per msearch request
+            max_wait_ms: How long to wait for more searches after the first arrives
+        """
+        self.indexer = indexer
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+        self._inflight: set[asyncio.Task] = set()
+    
+    def start(self):
+        """Start the background dispatch loop"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+    
+    async def stop(self):
+        """Stop the dispatch loop and wait for in-flight batches"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        
+        if self._inflight:
+            await asyncio.gather(*self._inflight, return_exceptions=True)
+        
+        # Fail anything still queued so callers don't hang
+        while not self.queue.empty():
+            _, _, future = self.queue.get_nowait()
+            if not future.done():
+                future.set_exception(RuntimeError("Search batcher stopped"))
+    
+    async def submit(self, query: str, limit: int) -> List[Dict[str, Any]]:
+        """
+        Queue a search and wait for its results.
+        
+        Args:
+            query: Search query string
+            limit: Maximum number of results
+        
+        Returns:
+            List of matching documents with scores
+            
+        Raises:
+            SearchError: If Elasticsearch could not run the search
+        """
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((query, limit, future))
+        return await future
+    
+    async def _run(self):
+        """Drain the queue into batches of up to max_batch searches"""
+        loop = asyncio.get_running_loop()
+        
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.max_wait
+            
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            
+            # Dispatch without blocking collection of the next batch
+            task = asyncio.create_task(self._dispatch(batch))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+    
+    async def _dispatch(self, batch: List[Tuple[str, int, asyncio.Future]]):
+        """Run one batch through msearch and resolve each caller's future"""
+        queries = [(query, limit) for query, limit, _ in batch]
+        
+        try:
+            # The Elasticsearch client is synchronous - keep it off the event loop
+            results = await asyncio.to_thread(self.indexer.multi_search, queries)
+        except Exception as e:
+            logger.error(f"Batched search failed: {e}")
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        
+        for (_, _, future), hits in zip(batch, results):
+            if future.done():
+                continue
+            # A query that failed on its own fails only its caller
+            if isinstance(hits, Exception):
+                future.set_exception(hits)
+            else:
+                future.set_result(hits)
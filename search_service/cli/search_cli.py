@@ -5,20 +5,30 @@ Calls the FastAPI search endpoint and displays results.
 Usage:
     python search_cli.py "your search query"
     python search_cli.py "your search query" --limit 5
+    python search_cli.py --batch queries.txt
 """
 import sys
+import asyncio
+import httpx
 import requests
 import click
-from typing import Optional
+from requests.adapters import HTTPAdapter
+from typing import List, Optional
 
 # API configuration
 API_BASE_URL = "http://localhost:8000"
 
+# Shared session - health check and search reuse one keep-alive connection
+session = requests.Session()
+session.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+session.headers["Connection"] = "keep-alive"
+
 
 def check_api_status() -> bool:
     """Check if API server is running"""
     try:
-        response = requests.get(f"{API_BASE_URL}/health", timeout=2)
+        response = session.get(f"{API_BASE_URL}/health", timeout=2)
         return response.status_code == 200
     except requests.exceptions.ConnectionError:
         return False
@@ -38,7 +48,7 @@ def search_documents(query: str, limit: int = 10) -> Optional[dict]:
         Search results dict or None if error
     """
     try:
-        response = requests.get(
+        response = session.get(
             f"{API_BASE_URL}/search",
             params={"q": query, "limit": limit},
             timeout=10
@@ -62,9 +72,87 @@ def search_documents(query: str, limit: int = 10) -> Optional[dict]:
         return None
 
 
+def load_queries(path: str) -> List[str]:
+    """
+    Read one query per line from a file, skipping blank lines.
+    
+    Args:
+        path: Path to the queries file
+        
+    Returns:
+        List of query strings
+    """
+    with open(path, encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+async def search_documents_async(
+    client: httpx.AsyncClient,
+    semaphore: asyncio.Semaphore,
+    query: str,
+    limit: int
+) -> Optional[dict]:
+    """
+    Call the search API endpoint on a shared async client.
+    
+    Args:
+        client: Shared async client
+        semaphore: Bounds the number of in-flight requests
+        query: Search query string
+        limit: Maximum number of results
+        
+    Returns:
+        Search results dict or None if error
+    """
+    async with semaphore:
+        try:
+            response = await client.get("/search", params={"q": query, "limit": limit})
+        except httpx.TimeoutException:
+            click.echo(f"Error: Request timed out for '{query}'", err=True)
+            return None
+        except httpx.HTTPError as e:
+            click.echo(f"Error: {str(e)} for '{query}'", err=True)
+            return None
+    
+    if response.status_code == 200:
+        return response.json()
+    
+    click.echo(f"Error: API returned status {response.status_code} for '{query}'", err=True)
+    click.echo(f"Details: {response.text}", err=True)
+    return None
+
+
+async def run_batch(queries: List[str], limit: int, concurrency: int = 10) -> List[Optional[dict]]:
+    """
+    Run many searches concurrently over a pool of keep-alive connections.
+    The API serves plain HTTP/1.1, so each in-flight request holds one connection.
+    
+    Args:
+        queries: Search query strings
+        limit: Maximum number of results per query
+        concurrency: Maximum number of in-flight requests
+        
+    Returns:
+        Search results dicts (None for failed queries), in query order
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    
+    async with httpx.AsyncClient(
+        base_url=API_BASE_URL,
+        limits=limits,
+        timeout=10
+    ) as client:
+        return await asyncio.gather(*[
+            search_documents_async(client, semaphore, query, limit)
+            for query in queries
+        ])
+
+
 def display_results(data: dict):
     """
     Display search results in a formatted way.
+    Output is built in one buffer and written with a single echo.
     
     Args:
         data: Search results dictionary from API
@@ -72,61 +160,62 @@ def display_results(data: dict):
     query = data.get('query', '')
     total = data.get('total_results', 0)
     results = data.get('results', [])
+    separator = "=" * 70
     
     # Header
-    click.echo()
-    click.echo("=" * 70)
-    click.echo(f"Search Results for: '{query}'")
-    click.echo("=" * 70)
-    click.echo(f"Found {total} result(s)\n")
+    lines = [
+        "",
+        separator,
+        f"Search Results for: '{query}'",
+        separator,
+        f"Found {total} result(s)\n",
+    ]
     
     if not results:
-        click.echo("No documents found matching your query.")
-        click.echo()
+        lines.append("No documents found matching your query.")
+        lines.append("")
+        click.echo("\n".join(lines))
         return
     
     # Display each result
     for i, result in enumerate(results, 1):
         # Result number and file name
-        click.echo(f"{i}. ", nl=False)
-        click.secho(result['file_name'], fg='cyan', bold=True)
+        lines.append(f"{i}. " + click.style(result['file_name'], fg='cyan', bold=True))
         
         # Score
         score = result.get('score', 0)
-        click.echo(f"   Score: ", nl=False)
-        click.secho(f"{score}", fg='green')
-        
-        # Path
-        click.echo(f"   Path:  {result['file_path']}")
+        lines.append("   Score: " + click.style(f"{score}", fg='green'))
         
-        # Type
-        click.echo(f"   Type:  {result['mime_type']}")
+        # Path and type
+        lines.append(f"   Path:  {result['file_path']}")
+        lines.append(f"   Type:  {result['mime_type']}")
         
         # URL (shortened for display)
         url = result.get('url', '')
         if url:
             display_url = url if len(url) < 60 else url[:57] + "..."
-            click.echo(f"   URL:   {display_url}")
+            lines.append(f"   URL:   {display_url}")
         
         # Highlights (matched snippets)
         highlights = result.get('highlights', [])
         if highlights:
-            click.echo(f"   Match: ", nl=False)
             # Remove HTML tags and truncate
             highlight_text = highlights[0].replace('<em>', '').replace('</em>', '')
             if len(highlight_text) > 80:
                 highlight_text = highlight_text[:77] + "..."
-            click.secho(f"...{highlight_text}...", fg='yellow')
+            lines.append("   Match: " + click.style(f"...{highlight_text}...", fg='yellow'))
         
-        click.echo()
+        lines.append("")
     
     # Footer
-    click.echo("=" * 70)
-    click.echo()
+    lines.append(separator)
+    lines.append("")
+    
+    click.echo("\n".join(lines))
 
 
 @click.command()
-@click.argument('query', type=str)
+@click.argument('query', type=str, required=False)
 @click.option(
     '--limit', '-l',
     default=10,
@@ -138,7 +227,12 @@ def display_results(data: dict):
     default=API_BASE_URL,
     help=f'API base URL (default: {API_BASE_URL})'
 )
-def main(query: str, limit: int, url: str):
+@click.option(
+    '--batch', '-b',
+    type=click.Path(exists=True, dir_okay=False),
+    help='File with one query per line; queries run concurrently'
+)
+def main(query: Optional[str], limit: int, url: str, batch: Optional[str]):
     """
     Search documents from the command line.
     
@@ -148,10 +242,19 @@ def main(query: str, limit: int, url: str):
         python search_cli.py "engineering"
         python search_cli.py "API documentation" --limit 5
         python search_cli.py "laptop" -l 3
+        python search_cli.py --batch queries.txt
     """
     global API_BASE_URL
     API_BASE_URL = url
     
+    if not query and not batch:
+        click.echo("Error: Provide a QUERY or --batch file", err=True)
+        sys.exit(1)
+    
+    if query and batch:
+        click.echo("Error: Provide either a QUERY or --batch file, not both", err=True)
+        sys.exit(1)
+    
     # Validate limit
     if limit < 1 or limit > 100:
         click.echo("Error: Limit must be between 1 and 100", err=True)
@@ -166,6 +269,19 @@ def main(query: str, limit: int, url: str):
         click.echo("  uvicorn search_service.api.app:app --reload", err=True)
         sys.exit(1)
     
+    # Batch mode: run all queries concurrently
+    if batch:
+        queries = load_queries(batch)
+        all_results = asyncio.run(run_batch(queries, limit))
+        
+        for results in all_results:
+            if results is not None:
+                display_results(results)
+        
+        if any(results is None for results in all_results):
+            sys.exit(1)
+        return
+    
     # Perform search
     results = search_documents(query, limit)
     
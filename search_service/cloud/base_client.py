@@ -2,13 +2,43 @@
 Abstract base class for cloud storage clients.
 Defines the interface that all storage providers must implement.
 """
+import hashlib
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+from typing import BinaryIO, Dict, Any, Iterable, Optional, Union
 from dataclasses import dataclass
 from datetime import datetime
 
+# Large downloads are hashed in slices of this size
+HASH_CHUNK_SIZE = 1024 * 1024
 
-@dataclass
+
+def content_hash(content: Union[bytes, BinaryIO]) -> str:
+    """
+    Hash file content to detect unchanged files.
+    
+    Args:
+        content: Raw file bytes, or a binary file (hashed from the start,
+            then rewound)
+        
+    Returns:
+        Hex digest (BLAKE2b, 128-bit)
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    
+    if isinstance(content, (bytes, bytearray, memoryview)):
+        view = memoryview(content)
+        for start in range(0, len(view), HASH_CHUNK_SIZE):
+            digest.update(view[start:start + HASH_CHUNK_SIZE])
+    else:
+        content.seek(0)
+        while chunk := content.read(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+        content.seek(0)
+    
+    return digest.hexdigest()
+
+
+@dataclass(slots=True)
 class CloudFile:
     """Represents a file in cloud storage"""
     file_id: str
@@ -19,6 +49,7 @@ class CloudFile:
     size: int  # Size in bytes
     modified_time: datetime
     created_time: datetime
+    md5_checksum: Optional[str] = None  # Provider checksum; None for Google Workspace files
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for indexing"""
@@ -30,23 +61,34 @@ class CloudFile:
             'mime_type': self.mime_type,
             'size': self.size,
             'modified_time': self.modified_time.isoformat(),
-            'created_time': self.created_time.isoformat()
+            'created_time': self.created_time.isoformat(),
+            'md5_checksum': self.md5_checksum
         }
 
 
+@dataclass(slots=True)
+class FileChange:
+    """A file added, modified or removed since a previous sync"""
+    file_id: str
+    file: Optional[CloudFile]  # None when the file left the synced folder (deleted, trashed, moved out)
+
+
 class BaseCloudClient(ABC):
     """Abstract base class for cloud storage clients"""
     
     @abstractmethod
-    def authenticate(self) -> bool:
+    def authenticate(self, interactive: bool = True) -> bool:
         """
         Authenticate with the cloud provider.
         Returns True if successful, False otherwise.
+        
+        Args:
+            interactive: Allow flows that need a user (e.g. a browser login)
         """
         pass
     
     @abstractmethod
-    def list_files(self, folder_id: Optional[str] = None) -> List[CloudFile]:
+    def list_files(self, folder_id: Optional[str] = None) -> Iterable[CloudFile]:
         """
         List all files in a folder (recursively).
         
@@ -54,17 +96,24 @@ class BaseCloudClient(ABC):
             folder_id: ID of folder to list. If None, uses configured folder.
             
         Returns:
-            List of CloudFile objects
+            Iterable of CloudFile objects (use list() to materialize)
         """
         pass
     
     @abstractmethod
-    def download_file(self, file_id: str) -> bytes:
+    def download_file(
+        self,
+        file_id: str,
+        mime_type: Optional[str] = None,
+        size: Optional[int] = None
+    ) -> bytes:
         """
         Download file content as bytes.
         
         Args:
             file_id: ID of file to download
+            mime_type: MIME type if already known (avoids a metadata lookup)
+            size: Size in bytes if already known
             
         Returns:
             File content as bytes
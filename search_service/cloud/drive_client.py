@@ -5,18 +5,26 @@ Handles file listing, downloading, and metadata retrieval.
 import os
 import json
 import logging
-from typing import List, Optional
+import queue
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 from datetime import datetime
 from pathlib import Path
 
+import requests
+from requests.adapters import HTTPAdapter
 from google.auth.transport.requests import Request
+from google_auth_httplib2 import AuthorizedHttp
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
-from googleapiclient.http import MediaIoBaseDownload
+from googleapiclient.http import MediaIoBaseDownload, build_http
 import io
 
-from .base_client import BaseCloudClient, CloudFile
+from .base_client import BaseCloudClient, CloudFile, FileChange
 from ..config import settings
 
 logger = logging.getLogger(__name__)
@@ -24,6 +32,27 @@ logger = logging.getLogger(__name__)
 # Scopes required for Drive API
 SCOPES = ['https://www.googleapis.com/auth/drive.readonly']
 
+# Download tuning
+DOWNLOAD_CHUNK_SIZE = 10 * 1024 * 1024  # Bytes per request
+PARALLEL_DOWNLOAD_THRESHOLD = 50 * 1024 * 1024  # Use ranged requests above this size
+PARALLEL_DOWNLOAD_WORKERS = 4
+DOWNLOAD_MANY_MAX_BYTES = 512 * 1024 * 1024  # Downloaded-but-unconsumed cap for download_many
+DOWNLOAD_MANY_UNKNOWN_SIZE = 10 * 1024 * 1024  # Estimate for exports, which list no size
+DOWNLOAD_MANY_MAX_PENDING = 4  # Downloads started or waiting to be consumed, per worker
+
+FOLDER_MIME_TYPE = 'application/vnd.google-apps.folder'
+FILE_FIELDS = "id, name, mimeType, size, webViewLink, modifiedTime, createdTime, md5Checksum"
+CHANGES_PAGE_SIZE = 1000
+
+
+@lru_cache(maxsize=1)
+def _load_credentials(token_path: str, mtime: float) -> Credentials:
+    """
+    Parse token.json once per file version.
+    The mtime is part of the cache key so a re-saved token is picked up.
+    """
+    return Credentials.from_authorized_user_file(token_path, SCOPES)
+
 
 class DriveClient(BaseCloudClient):
     """Google Drive client with OAuth authentication"""
@@ -32,11 +61,22 @@ class DriveClient(BaseCloudClient):
         self.service = None
         self.creds = None
         self.folder_id = settings.google_drive_folder_id
+        self._local = threading.local()
         
-    def authenticate(self) -> bool:
+        # Pooled session for ranged downloads of large files
+        self._http_session = requests.Session()
+        self._http_session.mount(
+            "https://", HTTPAdapter(pool_maxsize=PARALLEL_DOWNLOAD_WORKERS)
+        )
+        
+    def authenticate(self, interactive: bool = True) -> bool:
         """
         Authenticate with Google Drive using OAuth 2.0.
         Uses token.json if exists, otherwise initiates OAuth flow.
+        
+        Args:
+            interactive: Allow the browser OAuth flow. Servers pass False so a
+                missing or unrefreshable token fails fast instead of blocking
         """
         try:
             token_path = Path(settings.token_file)
@@ -44,8 +84,8 @@ class DriveClient(BaseCloudClient):
             # Load existing token if available
             if token_path.exists():
                 logger.info(f"Loading credentials from {token_path}")
-                self.creds = Credentials.from_authorized_user_file(
-                    str(token_path), SCOPES
+                self.creds = _load_credentials(
+                    str(token_path), token_path.stat().st_mtime
                 )
             
             # Refresh or get new credentials
@@ -53,6 +93,12 @@ class DriveClient(BaseCloudClient):
                 if self.creds and self.creds.expired and self.creds.refresh_token:
                     logger.info("Refreshing expired credentials")
                     self.creds.refresh(Request())
+                elif not interactive:
+                    logger.error(
+                        f"No valid token in {token_path} - run "
+                        "'python -m search_service.main' once to authorize"
+                    )
+                    return False
                 else:
                     logger.info("Starting OAuth flow - browser will open")
                     # Create credentials dict for OAuth flow
@@ -85,15 +131,22 @@ class DriveClient(BaseCloudClient):
             logger.error(f"Authentication failed: {e}")
             return False
     
-    def list_files(self, folder_id: Optional[str] = None) -> List[CloudFile]:
+    def list_files(
+        self,
+        folder_id: Optional[str] = None,
+        folders: Optional[Dict[str, str]] = None
+    ) -> Iterator[CloudFile]:
         """
         List all files in a folder (recursively includes subfolders).
+        Files are yielded as each listing page arrives.
         
         Args:
             folder_id: Drive folder ID. If None, uses configured folder.
+            folders: If given, filled with folder ID -> path for every folder
+                in the tree ("" for the root), as needed by list_changes()
             
-        Returns:
-            List of CloudFile objects
+        Yields:
+            CloudFile objects
         """
         if not self.service:
             raise RuntimeError("Not authenticated. Call authenticate() first.")
@@ -101,98 +154,459 @@ class DriveClient(BaseCloudClient):
         target_folder = folder_id or self.folder_id
         logger.info(f"Listing files in folder: {target_folder}")
         
-        files = []
-        folders_to_process = [(target_folder, "")]
+        file_count = 0
+        
+        # Each (folder, page) listing is a separate request on the pool;
+        # subfolders and next pages are submitted as soon as they are seen.
+        # Finished requests land on a FIFO queue, so collecting one is O(1)
+        # however many requests are still outstanding.
+        completed: queue.SimpleQueue = queue.SimpleQueue()
+        outstanding = 0
         
-        while folders_to_process:
-            current_folder_id, current_path = folders_to_process.pop(0)
+        with ThreadPoolExecutor(max_workers=settings.drive_list_workers) as executor:
             
-            # Query files and folders in current folder
-            query = f"'{current_folder_id}' in parents and trashed=false"
-            page_token = None
+            def submit(folder: str, path: str, page_token: Optional[str]):
+                future = executor.submit(self._list_folder_page, folder, page_token)
+                future.add_done_callback(lambda f: completed.put((f, folder, path)))
             
-            while True:
+            submit(target_folder, "", None)
+            outstanding += 1
+            if folders is not None:
+                folders[target_folder] = ""
+            
+            while outstanding:
+                future, current_folder_id, current_path = completed.get()
+                outstanding -= 1
+                
                 try:
-                    results = self.service.files().list(
-                        q=query,
-                        pageSize=100,
-                        fields="nextPageToken, files(id, name, mimeType, size, "
-                               "webViewLink, modifiedTime, createdTime)",
-                        pageToken=page_token
-                    ).execute()
-                    
-                    items = results.get('files', [])
-                    
-                    for item in items:
-                        mime_type = item['mimeType']
-                        item_name = item['name']
-                        item_path = f"{current_path}/{item_name}" if current_path else item_name
-                        
-                        # If it's a folder, add to queue for processing
-                        if mime_type == 'application/vnd.google-apps.folder':
-                            folders_to_process.append((item['id'], item_path))
-                            logger.debug(f"Found subfolder: {item_path}")
-                        else:
-                            # It's a file - add to results
-                            cloud_file = self._item_to_cloudfile(item, item_path)
-                            files.append(cloud_file)
-                            logger.debug(f"Found file: {item_path}")
-                    
-                    page_token = results.get('nextPageToken')
-                    if not page_token:
-                        break
-                        
+                    results = future.result()
                 except Exception as e:
                     logger.error(f"Error listing folder {current_folder_id}: {e}")
-                    break
+                    continue
+                
+                # Fetch the next page of this folder concurrently
+                page_token = results.get('nextPageToken')
+                if page_token:
+                    submit(current_folder_id, current_path, page_token)
+                    outstanding += 1
+                
+                for item in results.get('files', []):
+                    mime_type = item['mimeType']
+                    item_name = item['name']
+                    item_path = f"{current_path}/{item_name}" if current_path else item_name
+                    
+                    # If it's a folder, submit it for listing
+                    if mime_type == FOLDER_MIME_TYPE:
+                        submit(item['id'], item_path, None)
+                        outstanding += 1
+                        if folders is not None:
+                            folders[item['id']] = item_path
+                        logger.debug("Found subfolder: %s", item_path)
+                    else:
+                        # It's a file - add to results
+                        cloud_file = self._item_to_cloudfile(item, item_path)
+                        file_count += 1
+                        logger.debug("Found file: %s", item_path)
+                        yield cloud_file
+        
+        logger.info(f"Found {file_count} files")
+    
+    def _list_folder_page(self, folder_id: str, page_token: Optional[str]) -> dict:
+        """
+        Fetch one page of a folder listing.
+        Runs on the listing thread pool with a per-thread HTTP connection.
+        
+        Args:
+            folder_id: Drive folder ID
+            page_token: Page token from the previous page, or None for the first
+            
+        Returns:
+            Raw files().list response
+        """
+        query = f"'{folder_id}' in parents and trashed=false"
         
-        logger.info(f"Found {len(files)} files")
-        return files
+        return self.service.files().list(
+            q=query,
+            corpora="user",
+            spaces="drive",
+            pageSize=100,
+            fields=f"nextPageToken, files({FILE_FIELDS})",
+            pageToken=page_token
+        ).execute(http=self._thread_http())
     
-    def download_file(self, file_id: str) -> bytes:
+    def get_start_page_token(self) -> str:
+        """
+        Get the change token for the current state of the Drive.
+        Take it before a full listing so changes made during it are not missed.
+        """
+        if not self.service:
+            raise RuntimeError("Not authenticated. Call authenticate() first.")
+        
+        return self.service.changes().getStartPageToken().execute()['startPageToken']
+    
+    def list_changes(
+        self,
+        page_token: str,
+        folders: Dict[str, str]
+    ) -> Optional[Tuple[List[FileChange], str]]:
+        """
+        List changes to files in the synced folder tree since page_token.
+        Costs one request per page of changes, however many files the folder holds.
+        
+        Args:
+            page_token: Token from get_start_page_token() or a previous list_changes()
+            folders: Folder ID -> path for the tree, as filled in by list_files()
+            
+        Returns:
+            (changes, new page token), one change per file. None if the changes
+            can't be applied without a full listing: a folder in the tree was
+            added, moved, renamed or removed, or the token was rejected.
+        """
+        if not self.service:
+            raise RuntimeError("Not authenticated. Call authenticate() first.")
+        
+        # Latest change per file - a file can appear on several pages
+        changes: Dict[str, FileChange] = {}
+        
+        try:
+            while True:
+                response = self.service.changes().list(
+                    pageToken=page_token,
+                    spaces="drive",
+                    includeRemoved=True,
+                    pageSize=CHANGES_PAGE_SIZE,
+                    fields=f"nextPageToken, newStartPageToken, "
+                           f"changes(fileId, removed, file({FILE_FIELDS}, parents, trashed))"
+                ).execute(http=self._thread_http())
+                
+                for change in response.get('changes', []):
+                    file_id = change['fileId']
+                    item = change.get('file')
+                    
+                    if item and item['mimeType'] == FOLDER_MIME_TYPE:
+                        parent = (item.get('parents') or [None])[0]
+                        if file_id in folders or parent in folders:
+                            # Paths below it may have changed
+                            logger.info(f"Folder '{item['name']}' changed, full listing needed")
+                            return None
+                        continue
+                    
+                    if change.get('removed') or not item or item.get('trashed'):
+                        if file_id in folders:
+                            logger.info("A synced folder was removed, full listing needed")
+                            return None
+                        changes[file_id] = FileChange(file_id, None)
+                        continue
+                    
+                    parent = (item.get('parents') or [None])[0]
+                    if parent in folders:
+                        path = f"{folders[parent]}/{item['name']}" if folders[parent] else item['name']
+                        changes[file_id] = FileChange(file_id, self._item_to_cloudfile(item, path))
+                    else:
+                        # Elsewhere in the Drive, or moved out of the tree
+                        changes[file_id] = FileChange(file_id, None)
+                
+                if 'newStartPageToken' in response:
+                    return list(changes.values()), response['newStartPageToken']
+                page_token = response['nextPageToken']
+                
+        except Exception as e:
+            logger.error(f"Error listing changes: {e}")
+            return None
+    
+    def _thread_http(self) -> AuthorizedHttp:
+        """Get this thread's authorized HTTP object (httplib2 is not thread-safe)"""
+        http = getattr(self._local, 'http', None)
+        if http is None:
+            # build_http() is what discovery.build() uses: it sets the default
+            # socket timeout, so a stalled connection can't hang a worker forever
+            http = AuthorizedHttp(self.creds, http=build_http())
+            self._local.http = http
+        return http
+    
+    def download_file(
+        self,
+        file_id: str,
+        mime_type: Optional[str] = None,
+        size: Optional[int] = None
+    ) -> bytes:
         """
         Download file content as bytes.
         Handles both regular files and Google Workspace files (exports as PDF).
+        Large regular files are fetched as parallel ranged requests.
+        
+        Args:
+            file_id: ID of file to download
+            mime_type: MIME type from list_files(). Saves a metadata request when given.
+            size: Size in bytes from list_files(). Enables parallel download of large files.
         """
         if not self.service:
             raise RuntimeError("Not authenticated. Call authenticate() first.")
         
         try:
-            # Get file metadata to check type
-            file_meta = self.service.files().get(
-                fileId=file_id,
-                fields='mimeType'
-            ).execute()
+            mime_type = mime_type or self._get_mime_type(file_id)
             
-            mime_type = file_meta['mimeType']
-            
-            # Handle Google Workspace files (export as PDF)
-            if mime_type.startswith('application/vnd.google-apps'):
-                logger.debug(f"Exporting Google Workspace file {file_id} as PDF")
-                request = self.service.files().export_media(
-                    fileId=file_id,
-                    mimeType='application/pdf'
-                )
-            else:
-                # Regular file download
-                request = self.service.files().get_media(fileId=file_id)
+            if self._use_ranged(mime_type, size):
+                buffer = bytearray(size)
+                
+                def write(start: int, data: bytes):
+                    buffer[start:start + len(data)] = data
+                
+                self._download_ranged(file_id, size, write)
+                # Callers (hashing, caching, pdfium) expect immutable bytes. The copy
+                # only hits files over PARALLEL_DOWNLOAD_THRESHOLD, which the sync
+                # spools to disk (SYNC_SPOOL_BYTES) with download_to() instead
+                return bytes(buffer)
             
-            # Download file content
             file_buffer = io.BytesIO()
-            downloader = MediaIoBaseDownload(file_buffer, request)
-            
-            done = False
-            while not done:
-                status, done = downloader.next_chunk()
-                if status:
-                    logger.debug(f"Download progress: {int(status.progress() * 100)}%")
+            self._download_media(file_id, mime_type, file_buffer)
             
+            # BytesIO hands over its internal buffer here rather than copying it
+            # (nothing else holds a view), so this doesn't double peak memory
             content = file_buffer.getvalue()
-            logger.debug(f"Downloaded {len(content)} bytes")
+            logger.debug("Downloaded %s bytes", len(content))
             return content
             
         except Exception as e:
-            logger.error(f"Error downloading file {file_id}: {e}")
+            logger.error("Error downloading file %s: %s", file_id, e)
+            raise
+    
+    def download_to(
+        self,
+        file_id: str,
+        fp: BinaryIO,
+        mime_type: Optional[str] = None,
+        size: Optional[int] = None
+    ):
+        """
+        Download file content into a writable binary file.
+        Same as download_file(), but content is written to fp as it arrives
+        instead of being held in memory.
+        
+        Args:
+            file_id: ID of file to download
+            fp: Binary file to write to (e.g. a temporary file); left at its end
+            mime_type: MIME type from list_files(). Saves a metadata request when given.
+            size: Size in bytes from list_files(). Enables parallel download of large files.
+        """
+        if not self.service:
+            raise RuntimeError("Not authenticated. Call authenticate() first.")
+        
+        try:
+            mime_type = mime_type or self._get_mime_type(file_id)
+            
+            if self._use_ranged(mime_type, size):
+                # Ranges complete out of order - seek+write must not interleave
+                lock = threading.Lock()
+                
+                def write(start: int, data: bytes):
+                    with lock:
+                        fp.seek(start)
+                        fp.write(data)
+                
+                self._download_ranged(file_id, size, write)
+                fp.seek(0, io.SEEK_END)
+            else:
+                self._download_media(file_id, mime_type, fp)
+            
+        except Exception as e:
+            logger.error("Error downloading file %s: %s", file_id, e)
+            raise
+    
+    def _get_mime_type(self, file_id: str) -> str:
+        """Look up a file's MIME type (one metadata request)"""
+        file_meta = self.service.files().get(
+            fileId=file_id,
+            fields='mimeType'
+        ).execute(http=self._thread_http())
+        return file_meta['mimeType']
+    
+    def _use_ranged(self, mime_type: str, size: Optional[int]) -> bool:
+        """Whether to fetch as parallel ranged requests (large regular files only)"""
+        return (
+            not mime_type.startswith('application/vnd.google-apps')
+            and bool(size) and size > PARALLEL_DOWNLOAD_THRESHOLD
+        )
+    
+    def _download_media(self, file_id: str, mime_type: str, fp: BinaryIO):
+        """
+        Download a regular file, or export a Google Workspace file as PDF,
+        writing chunks to fp on this thread's connection.
+        """
+        if mime_type.startswith('application/vnd.google-apps'):
+            logger.debug("Exporting Google Workspace file %s as PDF", file_id)
+            request = self.service.files().export_media(
+                fileId=file_id,
+                mimeType='application/pdf'
+            )
+        else:
+            # Regular file download
+            request = self.service.files().get_media(fileId=file_id)
+        
+        request.http = self._thread_http()
+        downloader = MediaIoBaseDownload(
+            fp, request, chunksize=DOWNLOAD_CHUNK_SIZE
+        )
+        
+        done = False
+        while not done:
+            status, done = downloader.next_chunk()
+            if status and logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Download progress: %d%%", int(status.progress() * 100))
+    
+    def _download_ranged(self, file_id: str, size: int, write: Callable[[int, bytes], None]):
+        """
+        Download a large file as parallel HTTP Range requests.
+        Each chunk is passed to write(offset, data) as it arrives.
+        """
+        # Ranged requests go straight to the media endpoint with the OAuth token
+        if not self.creds.valid:
+            self.creds.refresh(Request())
+        
+        url = f"https://www.googleapis.com/drive/v3/files/{file_id}"
+        headers = {"Authorization": f"Bearer {self.creds.token}"}
+        
+        ranges = [
+            (start, min(start + DOWNLOAD_CHUNK_SIZE, size) - 1)
+            for start in range(0, size, DOWNLOAD_CHUNK_SIZE)
+        ]
+        
+        def fetch_range(byte_range):
+            start, end = byte_range
+            response = self._http_session.get(
+                url,
+                params={"alt": "media"},
+                headers={**headers, "Range": f"bytes={start}-{end}"},
+                timeout=60
+            )
+            response.raise_for_status()
+            
+            if len(response.content) != end - start + 1:
+                raise IOError(f"Short read for bytes {start}-{end} of {file_id}")
+            write(start, response.content)
+        
+        logger.debug("Downloading %s in %s parallel ranges", file_id, len(ranges))
+        with ThreadPoolExecutor(max_workers=PARALLEL_DOWNLOAD_WORKERS) as executor:
+            list(executor.map(fetch_range, ranges))
+        
+        logger.debug("Downloaded %s bytes", size)
+    
+    def download_many(
+        self,
+        files: Iterable[CloudFile],
+        max_workers: Optional[int] = None,
+        max_inflight_bytes: int = DOWNLOAD_MANY_MAX_BYTES,
+        spool_threshold: Optional[int] = None
+    ) -> Iterator[Tuple[CloudFile, Union[bytes, BinaryIO, None]]]:
+        """
+        Download many files concurrently, yielding each as it completes.
+        New downloads are only started while the bytes downloaded but not yet
+        consumed stay under max_inflight_bytes. Downloads are counted at their
+        listed size (or an estimate for exports) until they complete, then at
+        their actual size. At most DOWNLOAD_MANY_MAX_PENDING downloads per
+        worker are pending at once.
+        
+        Args:
+            files: Files to download (from list_files())
+            max_workers: Concurrent downloads (default: settings.drive_download_workers)
+            max_inflight_bytes: Cap on downloaded-but-unconsumed bytes held in memory
+            spool_threshold: Files larger than this are downloaded to a named
+                temporary file instead of memory (default: keep all in memory)
+            
+        Yields:
+            (file, content) tuples in completion order. content is bytes, an open
+            temporary file positioned at the start (close it to delete it), or
+            None if the download failed.
+        """
+        if not self.service:
+            raise RuntimeError("Not authenticated. Call authenticate() first.")
+        
+        max_workers = max_workers or settings.drive_download_workers
+        max_outstanding = max_workers * DOWNLOAD_MANY_MAX_PENDING
+        pending = iter(files)
+        completed: queue.SimpleQueue = queue.SimpleQueue()
+        outstanding = 0
+        # Updated by download threads as they finish, so guarded by a lock
+        inflight_bytes = 0
+        inflight_lock = threading.Lock()
+        
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        
+        def spooled(file: CloudFile) -> bool:
+            return spool_threshold is not None and (file.size or 0) > spool_threshold
+        
+        def expected_bytes(file: CloudFile) -> int:
+            # Spooled files are on disk and don't count toward the memory cap
+            if spooled(file):
+                return 0
+            return file.size or DOWNLOAD_MANY_UNKNOWN_SIZE
+        
+        def finished(future, file: CloudFile):
+            nonlocal inflight_bytes
+            # Swap the estimate for the bytes actually held in memory
+            held_bytes = 0
+            if not future.cancelled() and future.exception() is None:
+                content = future.result()
+                held_bytes = len(content) if isinstance(content, bytes) else 0
+            with inflight_lock:
+                inflight_bytes += held_bytes - expected_bytes(file)
+            completed.put((future, file, held_bytes))
+        
+        def has_room() -> bool:
+            with inflight_lock:
+                return inflight_bytes < max_inflight_bytes
+        
+        def schedule():
+            nonlocal outstanding, inflight_bytes
+            # Always keep at least one download going so oversized files still progress
+            while outstanding == 0 or (outstanding < max_outstanding and has_room()):
+                file = next(pending, None)
+                if file is None:
+                    return
+                if spooled(file):
+                    future = executor.submit(self._download_to_tempfile, file)
+                else:
+                    future = executor.submit(self.download_file, file.file_id, file.mime_type, file.size)
+                with inflight_lock:
+                    inflight_bytes += expected_bytes(file)
+                outstanding += 1
+                future.add_done_callback(lambda f, file=file: finished(f, file))
+        
+        try:
+            schedule()
+            while outstanding:
+                future, file, held_bytes = completed.get()
+                outstanding -= 1
+                
+                try:
+                    content = future.result()
+                except Exception:
+                    # Already logged by download_file
+                    content = None
+                
+                yield file, content
+                
+                # The consumer is done with this file - make room for more
+                with inflight_lock:
+                    inflight_bytes -= held_bytes
+                schedule()
+        finally:
+            # Stop queued downloads if the consumer stops early
+            executor.shutdown(wait=True, cancel_futures=True)
+    
+    def _download_to_tempfile(self, file: CloudFile) -> BinaryIO:
+        """
+        Download a file into a named temporary file (deleted when closed).
+        Named, so other processes can open it by path.
+        """
+        fp = tempfile.NamedTemporaryFile(prefix="drive-")
+        try:
+            self.download_to(file.file_id, fp, file.mime_type, file.size)
+            fp.flush()
+            fp.seek(0)
+            return fp
+        except BaseException:
+            fp.close()
             raise
     
     def get_file_metadata(self, file_id: str) -> CloudFile:
@@ -203,8 +617,7 @@ class DriveClient(BaseCloudClient):
         try:
             item = self.service.files().get(
                 fileId=file_id,
-                fields="id, name, mimeType, size, webViewLink, "
-                       "modifiedTime, createdTime"
+                fields=FILE_FIELDS
             ).execute()
             
             return self._item_to_cloudfile(item, item['name'])
@@ -222,10 +635,8 @@ class DriveClient(BaseCloudClient):
             url=item.get('webViewLink', ''),
             mime_type=item['mimeType'],
             size=int(item.get('size', 0)),
-            modified_time=datetime.fromisoformat(
-                item['modifiedTime'].replace('Z', '+00:00')
-            ),
-            created_time=datetime.fromisoformat(
-                item['createdTime'].replace('Z', '+00:00')
-            )
+            # Python 3.11+ parses the trailing 'Z' directly
+            modified_time=datetime.fromisoformat(item['modifiedTime']),
+            created_time=datetime.fromisoformat(item['createdTime']),
+            md5_checksum=item.get('md5Checksum')
         )
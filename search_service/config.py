@@ -2,6 +2,7 @@
 Configuration management using pydantic-settings.
 Loads from .env file and provides type-safe access to all settings.
 """
+from functools import lru_cache
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from typing import Optional
 
@@ -14,18 +15,48 @@ class Settings(BaseSettings):
     google_client_secret: str
     google_redirect_uri: str = "http://localhost:8000/auth/callback"
     google_drive_folder_id: str
+    drive_list_workers: int = 8  # Concurrent folder listing requests
+    drive_download_workers: int = 8  # Concurrent file downloads in download_many()
     
     # Elasticsearch Configuration
     elasticsearch_host: str = "http://localhost:9200"
     elasticsearch_index: str = "documents"
+    elasticsearch_pool_size: int = 25  # Pooled connections per node (>= expected concurrency)
+    elasticsearch_request_timeout: int = 10  # Seconds
     
     # API Configuration
     api_host: str = "0.0.0.0"
     api_port: int = 8000
+    api_reload: bool = False  # Dev only - auto-reload disables uvloop optimizations
+    api_access_log: bool = False  # Per-request access logging is costly under load
+    admin_token: str = ""  # Bearer token for the admin endpoints (empty disables them)
+    
+    # Search Result Cache
+    search_cache_size: int = 1024
+    search_cache_ttl: int = 60  # Seconds
+    search_http_max_age: int = 30  # Cache-Control max-age for /search responses
+    
+    # Search Request Batching (_msearch)
+    search_batch_size: int = 32
+    search_batch_wait_ms: float = 5
+    
+    # Sync Pipeline
+    sync_workers: int = 8  # Files downloaded/extracted concurrently
+    sync_extract_workers: int = 0  # Extraction processes (0 = CPU count)
+    sync_bulk_size: int = 500  # Documents per bulk index request
+    sync_bulk_bytes: int = 10 * 1024 * 1024  # Maximum bulk request body size
+    sync_spool_bytes: int = 10 * 1024 * 1024  # Larger downloads go to temp files (0 = never)
+    
+    # Extracted Text Cache (on disk, keyed by content hash)
+    extract_cache_dir: str = ".cache/extract"  # Empty disables the cache
+    extract_cache_bytes: int = 1024 * 1024 * 1024  # Least recently used entries evicted above this
     
     # OAuth Token Storage
     token_file: str = "token.json"
     
+    # Drive change token and folder tree from the last successful sync
+    sync_state_file: str = ".sync_state.json"
+    
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
@@ -38,6 +69,7 @@ class Settings(BaseSettings):
 settings = Settings()
 
 
+@lru_cache
 def get_settings() -> Settings:
     """Dependency injection helper for FastAPI"""
     return settings
@@ -2,8 +2,154 @@
 Abstract base class for text extractors.
 Defines the interface that all extractors must implement.
 """
+import re
 from abc import ABC, abstractmethod
-from typing import Optional
+from io import BytesIO
+from typing import BinaryIO, Optional, Tuple, Union
+
+import charset_normalizer
+
+# Extractors take raw bytes or a seekable binary file (e.g. a spooled download)
+FileContent = Union[bytes, BinaryIO]
+
+# Trailing whitespace, line break, then any blank lines / leading whitespace
+_LINE_BREAK_RE = re.compile(r'[^\S\n]*\n\s*')
+
+
+def normalize_lines(text: str) -> str:
+    """
+    Strip every line and drop blank lines in a single regex pass.
+    
+    Args:
+        text: Raw extracted text
+    
+    Returns:
+        Text with one non-blank, stripped line per line break
+    """
+    return _LINE_BREAK_RE.sub('\n', text).strip()
+
+
+def read_content(content: FileContent) -> bytes:
+    """
+    Get the whole content as bytes.
+    
+    Args:
+        content: Raw bytes, or a binary file (read from the start)
+    
+    Returns:
+        Content bytes (the same object when bytes were passed)
+    """
+    if isinstance(content, (bytes, bytearray, memoryview)):
+        return content
+    content.seek(0)
+    return content.read()
+
+
+def open_content(content: FileContent) -> BinaryIO:
+    """
+    Get the content as a binary file for parsers that stream.
+    
+    Args:
+        content: Raw bytes, or a binary file
+    
+    Returns:
+        File positioned at the start (bytes are wrapped without copying)
+    """
+    if isinstance(content, (bytes, bytearray, memoryview)):
+        return BytesIO(content)
+    content.seek(0)
+    return content
+
+
+def read_head(content: FileContent, size: int) -> bytes:
+    """
+    Get the first bytes of the content without consuming a file.
+    
+    Args:
+        content: Raw bytes, or a binary file
+        size: Number of bytes to read
+    
+    Returns:
+        Up to size bytes from the start
+    """
+    if isinstance(content, (bytes, bytearray, memoryview)):
+        return bytes(content[:size])
+    content.seek(0)
+    head = content.read(size)
+    content.seek(0)
+    return head
+
+
+# Bytes sampled when guessing the encoding of non-UTF-8 content
+_ENCODING_SAMPLE_SIZE = 8192
+
+# Shorter samples are too small to guess from - a few accented bytes
+# "fit" dozens of code pages equally well (latin-1 "café" reads as UTF-16)
+_ENCODING_MIN_SAMPLE = 64
+
+# A guess is only trusted if the text it gives is clean and reads like a language
+_ENCODING_MAX_CHAOS = 0.2
+_ENCODING_MIN_COHERENCE = 0.1
+
+# Fallbacks for untrusted guesses: cp1252 covers typical Western office text
+# (incl. € and smart quotes); latin-1 decodes any byte sequence
+_WESTERN_ENCODING = 'cp1252'
+_LAST_RESORT_ENCODING = 'latin-1'
+
+
+def _guess_encoding(sample: bytes) -> Optional[str]:
+    """
+    Guess the encoding of a non-UTF-8 sample.
+    
+    Args:
+        sample: Start of the content
+    
+    Returns:
+        Encoding name, or None if no guess is confident enough
+    """
+    if len(sample) < _ENCODING_MIN_SAMPLE:
+        return None
+    
+    matches = charset_normalizer.from_bytes(sample)
+    best = matches.best()
+    if (best is None or best.chaos > _ENCODING_MAX_CHAOS
+            or best.coherence < _ENCODING_MIN_COHERENCE):
+        return None
+    
+    # Several code pages often decode Western text equally well (cp1250 turns
+    # "São" into "Săo") - prefer cp1252 whenever it scores as well as the best
+    for match in matches:
+        if (_WESTERN_ENCODING in match.could_be_from_charset
+                and match.chaos <= best.chaos and match.coherence >= best.coherence):
+            return _WESTERN_ENCODING
+    return best.encoding
+
+
+def decode_text(content: bytes) -> Tuple[str, str]:
+    """
+    Decode file content, sniffing the encoding when it isn't UTF-8.
+    
+    Args:
+        content: Raw file content
+    
+    Returns:
+        Tuple of (decoded text, encoding used)
+    """
+    try:
+        return content.decode('utf-8'), 'utf-8'
+    except UnicodeDecodeError:
+        pass
+    
+    # Guess from a sample so the content is decoded exactly once more
+    encoding = _guess_encoding(content[:_ENCODING_SAMPLE_SIZE])
+    if encoding:
+        return content.decode(encoding, errors='replace'), encoding
+    
+    try:
+        return content.decode(_WESTERN_ENCODING), _WESTERN_ENCODING
+    except UnicodeDecodeError:
+        # Bytes cp1252 leaves undefined (0x81, 0x8D, ...)
+        return content.decode(_LAST_RESORT_ENCODING), _LAST_RESORT_ENCODING
 
 
 class BaseExtractor(ABC):
@@ -17,24 +163,24 @@ class BaseExtractor(ABC):
         Args:
             mime_type: MIME type of the file
             filename: Name of the file (to check extension)
-            
+        
         Returns:
             True if this extractor can handle the file, False otherwise
         """
         pass
     
     @abstractmethod
-    def extract_text(self, content: bytes, filename: str) -> str:
+    def extract_text(self, content: FileContent, filename: str) -> str:
         """
         Extract text content from file bytes.
         
         Args:
-            content: Raw file content as bytes
+            content: Raw file content as bytes, or a seekable binary file
             filename: Name of the file (for context/extension checking)
-            
+        
         Returns:
             Extracted text content as string
-            
+        
         Raises:
             Exception: If extraction fails
         """
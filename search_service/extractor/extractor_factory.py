@@ -3,25 +3,42 @@ Extractor factory and manager.
 Selects the appropriate extractor based on file type.
 """
 import logging
-from typing import Optional
-from .base_extractor import BaseExtractor
+from functools import lru_cache
+from typing import Optional, Union
+
+import diskcache
+
+from .base_extractor import BaseExtractor, FileContent
 from .text_extractor import TextExtractor
 from .csv_extractor import CSVExtractor
 from .pdf_extractor import PDFExtractor
 from .image_extractor import ImageExtractor
+from .extractor_registry import ExtractorRegistry
+from ..cloud.base_client import content_hash
 
 logger = logging.getLogger(__name__)
 
+# Default size limit of the extracted text cache
+EXTRACT_CACHE_BYTES = 1024 * 1024 * 1024
+
 
 class ExtractorFactory:
     """Factory for getting the right extractor for a file type"""
     
-    def __init__(self, include_ocr: bool = False):
+    def __init__(
+        self,
+        include_ocr: bool = False,
+        cache_dir: Optional[str] = None,
+        cache_bytes: int = EXTRACT_CACHE_BYTES
+    ):
         """
         Initialize factory with all available extractors.
         
         Args:
             include_ocr: Whether to include image OCR extractor (requires tesseract)
+            cache_dir: Directory for the extracted text cache (None disables it).
+                Safe to share between processes.
+            cache_bytes: Cache size limit; least recently used entries are evicted
         """
         self.extractors: list[BaseExtractor] = [
             TextExtractor(),
@@ -37,6 +54,34 @@ class ExtractorFactory:
                 logger.info("Image OCR extractor enabled")
             else:
                 logger.warning("Image OCR requested but tesseract not available")
+        
+        # Build the MIME/extension dispatch table once
+        self.registry = ExtractorRegistry()
+        for extractor in self.extractors:
+            self.registry.register(extractor)
+        
+        # Unchanged content is never parsed twice, across runs and processes
+        self.cache: Optional[diskcache.Cache] = None
+        if cache_dir:
+            self.cache = diskcache.Cache(
+                cache_dir,
+                size_limit=cache_bytes,
+                eviction_policy='least-recently-used'
+            )
+    
+    def resolve(self, mime_type: str, filename: str) -> Optional[BaseExtractor]:
+        """
+        Look up the extractor for a file without logging.
+        Use once per file and reuse the result for support checks and extraction.
+        
+        Args:
+            mime_type: MIME type of the file
+            filename: Name of the file
+            
+        Returns:
+            Extractor instance if supported, None otherwise
+        """
+        return self.registry.lookup(mime_type, filename)
     
     def get_extractor(self, mime_type: str, filename: str) -> Optional[BaseExtractor]:
         """
@@ -49,22 +94,30 @@ class ExtractorFactory:
         Returns:
             Extractor instance if supported, None otherwise
         """
-        for extractor in self.extractors:
-            if extractor.can_extract(mime_type, filename):
-                logger.debug(f"Selected {extractor.__class__.__name__} for {filename}")
-                return extractor
+        extractor = self.resolve(mime_type, filename)
+        if extractor:
+            # Lazy formatting - this runs for every file and debug is usually off
+            logger.debug("Selected %s for %s", type(extractor).__name__, filename)
+            return extractor
         
-        logger.warning(f"No extractor found for {filename} (MIME: {mime_type})")
+        logger.warning("No extractor found for %s (MIME: %s)", filename, mime_type)
         return None
     
-    def extract_text(self, content: bytes, mime_type: str, filename: str) -> Optional[str]:
+    def extract_text(
+        self,
+        content: FileContent,
+        mime_type: str,
+        filename: str,
+        digest: Optional[str] = None
+    ) -> Optional[str]:
         """
         Extract text from file content.
         
         Args:
-            content: Raw file content
+            content: Raw file content, or a seekable binary file
             mime_type: MIME type of the file
             filename: Name of the file
+            digest: content_hash() of the content, if the caller already has it
             
         Returns:
             Extracted text or None if extraction failed/not supported
@@ -73,13 +126,69 @@ class ExtractorFactory:
         if not extractor:
             return None
         
+        # The content hash covers everything that affects the result except
+        # which extractor parses it (the same bytes can be .txt or .csv)
+        key = None
+        if self.cache is not None:
+            key = f"{type(extractor).__name__}:{digest or content_hash(content)}"
+            text = self._cache_get(key)
+            if text is not None:
+                logger.debug("Extraction cache hit for %s", filename)
+                return text
+        
         try:
             text = extractor.extract_text(content, filename)
-            return text
         except Exception as e:
-            logger.error(f"Extraction failed for {filename}: {e}")
+            logger.error("Extraction failed for %s: %s", filename, e)
+            return None
+        
+        if key is not None:
+            self._cache_set(key, text)
+        return text
+    
+    def _cache_get(self, key: str) -> Optional[str]:
+        """Read from the extraction cache; a cache failure is only a miss"""
+        try:
+            return self.cache.get(key)
+        except Exception as e:
+            logger.warning("Extraction cache read failed: %s", e)
             return None
     
+    def _cache_set(self, key: str, text: str):
+        """Write to the extraction cache; failures don't fail the extraction"""
+        try:
+            self.cache.set(key, text)
+        except Exception as e:
+            logger.warning("Extraction cache write failed: %s", e)
+    
     def is_supported(self, mime_type: str, filename: str) -> bool:
         """Check if a file type is supported"""
-        return self.get_extractor(mime_type, filename) is not None
+        return self.resolve(mime_type, filename) is not None
+
+
+@lru_cache(maxsize=None)
+def _worker_factory(include_ocr: bool, cache_dir: Optional[str], cache_bytes: int) -> ExtractorFactory:
+    """One factory per worker process, built on first use"""
+    return ExtractorFactory(include_ocr=include_ocr, cache_dir=cache_dir, cache_bytes=cache_bytes)
+
+
+def extract_in_worker(
+    content: Union[bytes, str],
+    mime_type: str,
+    filename: str,
+    include_ocr: bool = False,
+    digest: Optional[str] = None,
+    cache_dir: Optional[str] = None,
+    cache_bytes: int = EXTRACT_CACHE_BYTES
+) -> Optional[str]:
+    """
+    Extract text in a ProcessPoolExecutor worker.
+    Module-level so it can be pickled; see ExtractorFactory.extract_text.
+    content is either the raw bytes or the path of a file holding them, so
+    large files reach the worker without being pickled through a pipe.
+    """
+    factory = _worker_factory(include_ocr, cache_dir, cache_bytes)
+    if isinstance(content, str):
+        with open(content, 'rb') as fp:
+            return factory.extract_text(fp, mime_type, filename, digest)
+    return factory.extract_text(content, mime_type, filename, digest)
@@ -0,0 +1,48 @@
+"""
+Extractor registry.
+Maps MIME types and file extensions to extractors for constant-time dispatch.
+"""
+import os
+from typing import Optional
+from .base_extractor import BaseExtractor
+
+
+class ExtractorRegistry:
+    """Dispatch table from MIME type / extension to extractor"""
+    
+    def __init__(self):
+        self._by_mime: dict[str, BaseExtractor] = {}
+        self._by_ext: dict[str, BaseExtractor] = {}
+    
+    def register(self, extractor: BaseExtractor):
+        """
+        Register an extractor for all its supported MIME types and extensions.
+        Earlier registrations win when two extractors claim the same key.
+        
+        Args:
+            extractor: Extractor instance to register
+        """
+        for mime_type in extractor.get_supported_mime_types():
+            self._by_mime.setdefault(mime_type, extractor)
+        
+        for ext in extractor.get_supported_extensions():
+            self._by_ext.setdefault(ext.lower(), extractor)
+    
+    def lookup(self, mime_type: str, filename: str) -> Optional[BaseExtractor]:
+        """
+        Find the extractor for a file, by MIME type first, then extension.
+        A known MIME type always wins over the extension: notes.txt served
+        as text/csv is parsed as CSV. The extension is only used when the
+        MIME type is unknown (e.g. application/octet-stream).
+        
+        Args:
+            mime_type: MIME type of the file
+            filename: Name of the file
+            
+        Returns:
+            Extractor instance if supported, None otherwise
+        """
+        extractor = self._by_mime.get(mime_type)
+        if extractor is None:
+            extractor = self._by_ext.get(os.path.splitext(filename)[1].lower())
+        return extractor
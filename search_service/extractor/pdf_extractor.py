@@ -1,67 +1,100 @@
 """
-PDF file extractor using pdfminer.six.
+PDF file extractor using pypdfium2 (PDFium), with pdfminer.six as fallback.
 Extracts text content from PDF documents.
 """
 import logging
-from io import BytesIO
-from pdfminer.high_level import extract_text
+from io import StringIO
+import pypdfium2 as pdfium
+from pdfminer.high_level import extract_text_to_fp
+from pdfminer.layout import LAParams
 from pdfminer.pdfparser import PDFSyntaxError
-from .base_extractor import BaseExtractor
+from .base_extractor import BaseExtractor, FileContent, normalize_lines, open_content, read_head
 
 logger = logging.getLogger(__name__)
 
+# Readers accept the %PDF- header anywhere in the first 1KB
+PDF_MAGIC = b'%PDF-'
+PDF_MAGIC_WINDOW = 1024
+
+# Shared layout settings - built once instead of per document
+LAYOUT_PARAMS = LAParams(detect_vertical=False, all_texts=False)
+
 
 class PDFExtractor(BaseExtractor):
     """Extractor for PDF files"""
     
+    # Supported MIME types and extensions
+    _MIME_TYPES = frozenset({
+        'application/pdf',
+        'application/x-pdf',
+    })
+    _EXTENSIONS = ('.pdf',)
+    
     def can_extract(self, mime_type: str, filename: str) -> bool:
         """Check if file is a PDF"""
-        # Check MIME type
-        if mime_type in self.get_supported_mime_types():
-            return True
-        
-        # Check file extension
-        filename_lower = filename.lower()
-        return any(filename_lower.endswith(ext) for ext in self.get_supported_extensions())
+        # Check MIME type, then file extension (endswith takes the whole tuple)
+        return mime_type in self._MIME_TYPES or filename.lower().endswith(self._EXTENSIONS)
     
-    def extract_text(self, content: bytes, filename: str) -> str:
+    def _extract_with_pdfium(self, content: FileContent) -> str:
+        """Extract text in native code via PDFium (reads files without loading them)"""
+        pdf = pdfium.PdfDocument(content if isinstance(content, bytes) else open_content(content))
+        try:
+            pages = []
+            for page in pdf:
+                textpage = page.get_textpage()
+                pages.append(textpage.get_text_range())
+                textpage.close()
+                page.close()
+            return "\n".join(pages)
+        finally:
+            pdf.close()
+    
+    def _extract_with_pdfminer(self, content: FileContent) -> str:
+        """Extract text with pure-Python pdfminer (slower, more lenient)"""
+        output = StringIO()
+        extract_text_to_fp(open_content(content), output, laparams=LAYOUT_PARAMS, codec=None)
+        return output.getvalue()
+    
+    def extract_text(self, content: FileContent, filename: str) -> str:
         """
-        Extract text from PDF using pdfminer.six.
+        Extract text from PDF using PDFium, falling back to pdfminer.six
+        for files PDFium rejects.
         """
+        # Bail before either parser on content that isn't a PDF at all
+        if PDF_MAGIC not in read_head(content, PDF_MAGIC_WINDOW):
+            logger.error("Invalid PDF format for %s: missing %%PDF- header", filename)
+            raise ValueError(f"Invalid PDF file {filename}: missing %PDF- header")
+        
         try:
-            # Create BytesIO object from content
-            pdf_file = BytesIO(content)
-            
-            # Extract text using pdfminer
-            text = extract_text(pdf_file)
+            try:
+                text = self._extract_with_pdfium(content)
+            except pdfium.PdfiumError as e:
+                logger.warning("PDFium could not read %s (%s), falling back to pdfminer", filename, e)
+                text = self._extract_with_pdfminer(content)
             
             if not text or not text.strip():
-                logger.warning(f"No text extracted from PDF {filename} (might be image-based)")
+                logger.warning("No text extracted from PDF %s (might be image-based)", filename)
                 return ""
             
             # Clean up the text
-            # Remove excessive whitespace and normalize line breaks
-            lines = [line.strip() for line in text.split('\n') if line.strip()]
-            extracted_text = "\n".join(lines)
+            # Strip each line and drop blank lines in one regex pass
+            extracted_text = normalize_lines(text)
             
-            logger.debug(f"Extracted {len(extracted_text)} chars from PDF {filename}")
-            return extracted_text.strip()
+            logger.debug("Extracted %s chars from PDF %s", len(extracted_text), filename)
+            return extracted_text
             
         except PDFSyntaxError as e:
-            logger.error(f"Invalid PDF format for {filename}: {e}")
+            logger.error("Invalid PDF format for %s: %s", filename, e)
             raise ValueError(f"Invalid PDF file {filename}: {e}")
         
         except Exception as e:
-            logger.error(f"Error extracting from PDF {filename}: {e}")
+            logger.error("Error extracting from PDF %s: %s", filename, e)
             raise ValueError(f"Could not extract text from PDF {filename}: {e}")
     
     def get_supported_mime_types(self) -> list[str]:
         """Return supported MIME types for PDF files"""
-        return [
-            'application/pdf',
-            'application/x-pdf',
-        ]
+        return list(self._MIME_TYPES)
     
     def get_supported_extensions(self) -> list[str]:
         """Return supported file extensions"""
-        return ['.pdf']
+        return list(self._EXTENSIONS)
@@ -3,7 +3,7 @@ Text file extractor for .txt files.
 Handles plain text files with UTF-8 encoding.
 """
 import logging
-from .base_extractor import BaseExtractor
+from .base_extractor import BaseExtractor, FileContent, decode_text, read_content
 
 logger = logging.getLogger(__name__)
 
@@ -11,44 +11,38 @@ logger = logging.getLogger(__name__)
 class TextExtractor(BaseExtractor):
     """Extractor for plain text files"""
     
+    # Supported MIME types and extensions
+    _MIME_TYPES = frozenset({
+        'text/plain',
+        'text/txt',
+        'application/txt',
+    })
+    _EXTENSIONS = ('.txt', '.text')
+    
     def can_extract(self, mime_type: str, filename: str) -> bool:
         """Check if file is a text file"""
-        # Check MIME type
-        if mime_type in self.get_supported_mime_types():
-            return True
-        
-        # Check file extension
-        filename_lower = filename.lower()
-        return any(filename_lower.endswith(ext) for ext in self.get_supported_extensions())
+        # Check MIME type, then file extension (endswith takes the whole tuple)
+        return mime_type in self._MIME_TYPES or filename.lower().endswith(self._EXTENSIONS)
     
-    def extract_text(self, content: bytes, filename: str) -> str:
+    def extract_text(self, content: FileContent, filename: str) -> str:
         """
         Extract text from plain text file.
-        Tries UTF-8 first, falls back to latin-1 if needed.
+        Tries UTF-8 first, otherwise sniffs the encoding.
         """
         try:
-            # Try UTF-8 first
-            text = content.decode('utf-8')
-            logger.debug(f"Extracted {len(text)} chars from {filename} using UTF-8")
+            text, encoding = decode_text(read_content(content))
+            if encoding != 'utf-8':
+                logger.warning("Used %s fallback for %s", encoding, filename)
+            logger.debug("Extracted %s chars from %s using %s", len(text), filename, encoding)
             return text.strip()
-        except UnicodeDecodeError:
-            # Fallback to latin-1 (works for most Western text)
-            try:
-                text = content.decode('latin-1')
-                logger.warning(f"Used latin-1 fallback for {filename}")
-                return text.strip()
-            except Exception as e:
-                logger.error(f"Failed to decode {filename}: {e}")
-                raise ValueError(f"Could not decode text file {filename}: {e}")
+        except Exception as e:
+            logger.error("Failed to decode %s: %s", filename, e)
+            raise ValueError(f"Could not decode text file {filename}: {e}")
     
     def get_supported_mime_types(self) -> list[str]:
         """Return supported MIME types for text files"""
-        return [
-            'text/plain',
-            'text/txt',
-            'application/txt',
-        ]
+        return list(self._MIME_TYPES)
     
     def get_supported_extensions(self) -> list[str]:
         """Return supported file extensions"""
-        return ['.txt', '.text']
+        return list(self._EXTENSIONS)
@@ -127,6 +127,16 @@ class BaseIndexer(ABC):
         """
         pass
     
+    @abstractmethod
+    def count_documents(self) -> int:
+        """
+        Count documents in the index.
+        
+        Returns:
+            Number of indexed documents
+        """
+        pass
+    
     @abstractmethod
     def delete_index(self) -> bool:
         """
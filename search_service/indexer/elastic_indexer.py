@@ -3,14 +3,31 @@ Elasticsearch indexer implementation.
 Handles document indexing and search using Elasticsearch.
 """
 import logging
-from typing import List, Dict, Any, Optional
+from contextlib import contextmanager
+from typing import List, Dict, Any, Iterable, Optional, Tuple, Union
 from datetime import datetime
 from elasticsearch import Elasticsearch, exceptions as es_exceptions
+from elasticsearch.helpers import bulk, parallel_bulk
 from .base_indexer import BaseIndexer
+from .orjson_serializer import orjson_serializers
 from ..config import settings
 
 logger = logging.getLogger(__name__)
 
+# Bulk indexing: concurrent bulk requests, actions and bytes per request
+BULK_THREAD_COUNT = 4
+BULK_CHUNK_SIZE = 1000
+BULK_MAX_CHUNK_BYTES = 10 * 1024 * 1024
+
+# ID lookups: documents per mget request, hits per search_after page
+MGET_BATCH_SIZE = 1000
+ID_PAGE_SIZE = 10000
+PIT_KEEP_ALIVE = "1m"
+
+
+class SearchError(Exception):
+    """A search Elasticsearch could not run (unreachable, or the query failed)"""
+
 
 class ElasticIndexer(BaseIndexer):
     """Elasticsearch implementation of search indexer"""
@@ -24,7 +41,16 @@ class ElasticIndexer(BaseIndexer):
     def connect(self) -> bool:
         """Connect to Elasticsearch"""
         try:
-            self.client = Elasticsearch([self.host])
+            # One long-lived client per process: urllib3 keeps pooled
+            # keep-alive connections, so requests skip the TCP handshake.
+            # orjson handles (de)serialization of request/response bodies.
+            self.client = Elasticsearch(
+                [self.host],
+                connections_per_node=settings.elasticsearch_pool_size,
+                request_timeout=settings.elasticsearch_request_timeout,
+                http_compress=True,
+                serializers=orjson_serializers()
+            )
             
             # Test connection
             if not self.client.ping():
@@ -69,6 +95,8 @@ class ElasticIndexer(BaseIndexer):
                         "extracted_text": {"type": "text"},
                         "updated_time": {"type": "date"},
                         "indexed_time": {"type": "date"},
+                        "content_hash": {"type": "keyword"},
+                        "md5_checksum": {"type": "keyword"},
                         "size": {"type": "long"}
                     }
                 },
@@ -87,15 +115,22 @@ class ElasticIndexer(BaseIndexer):
             logger.error(f"Failed to create index: {e}")
             return False
     
-    def index_document(self, document: Dict[str, Any]) -> bool:
-        """Index a single document"""
+    def index_document(self, document: Dict[str, Any], refresh: bool = True) -> bool:
+        """
+        Index a single document.
+        
+        Args:
+            document: Document dict (see BaseIndexer.index_document)
+            refresh: Wait for the document to become searchable. Pass False
+                when indexing many documents and call refresh_index() once.
+        """
         if not self.client:
             raise RuntimeError("Not connected. Call connect() first.")
         
         try:
-            # Add indexed timestamp
-            doc = document.copy()
-            doc['indexed_time'] = datetime.utcnow().isoformat()
+            # Add indexed timestamp (copy and update in one step);
+            # the orjson serializer formats datetimes natively
+            doc = {**document, 'indexed_time': datetime.utcnow()}
             
             # Use file_id as document ID
             file_id = doc['file_id']
@@ -105,10 +140,10 @@ class ElasticIndexer(BaseIndexer):
                 index=self.index_name,
                 id=file_id,
                 document=doc,
-                refresh='wait_for'  # Make immediately searchable
+                refresh='wait_for' if refresh else False
             )
             
-            logger.debug(f"Indexed document: {doc['file_name']}")
+            logger.debug("Indexed document: %s", doc['file_name'])
             return True
             
         except Exception as e:
@@ -123,86 +158,210 @@ class ElasticIndexer(BaseIndexer):
         if not documents:
             return 0
         
-        try:
-            from elasticsearch.helpers import bulk
+        failed_ids = self.bulk_index_documents(documents)
+        success = len(documents) - len(failed_ids)
+        
+        # Single refresh for the whole batch instead of one per chunk
+        if success:
+            self.refresh_index()
+        
+        return success
+    
+    def bulk_index_documents(
+        self,
+        documents: List[Dict[str, Any]],
+        chunk_size: int = BULK_CHUNK_SIZE,
+        max_chunk_bytes: int = BULK_MAX_CHUNK_BYTES
+    ) -> List[str]:
+        """
+        Stream documents to Elasticsearch via the bulk API without refreshing.
+        
+        Args:
+            documents: Documents to index
+            chunk_size: Maximum actions per bulk request
+            max_chunk_bytes: Maximum size of a bulk request body
             
-            # Prepare bulk actions
-            actions = []
+        Returns:
+            file_ids of documents that failed to index
+        """
+        if not self.client:
+            raise RuntimeError("Not connected. Call connect() first.")
+        
+        def generate_actions():
+            # One timestamp per batch - every doc in it was indexed together
+            now = datetime.utcnow()
             for doc in documents:
-                doc_copy = doc.copy()
-                doc_copy['indexed_time'] = datetime.utcnow().isoformat()
-                
-                actions.append({
+                yield {
                     "_index": self.index_name,
-                    "_id": doc_copy['file_id'],
-                    "_source": doc_copy
-                })
-            
-            # Execute bulk indexing
-            success, failed = bulk(self.client, actions, refresh='wait_for')
+                    "_id": doc['file_id'],
+                    "_source": {**doc, 'indexed_time': now}
+                }
+        
+        try:
+            # Stream actions to a pool of bulk workers (no materialized list)
+            success = 0
+            failed_ids = []
+            for ok, info in parallel_bulk(
+                self.client,
+                generate_actions(),
+                thread_count=BULK_THREAD_COUNT,
+                chunk_size=chunk_size,
+                max_chunk_bytes=max_chunk_bytes,
+                queue_size=BULK_THREAD_COUNT,
+                raise_on_error=False
+            ):
+                if ok:
+                    success += 1
+                else:
+                    # info is {op_type: {'_id': ..., 'error': ...}}
+                    item = next(iter(info.values()))
+                    failed_ids.append(item.get('_id'))
+                    logger.error("Failed to index document: %s", info)
             
-            logger.info(f"Bulk indexed {success} documents ({failed} failed)")
-            return success
+            logger.info(f"Bulk indexed {success} documents ({len(failed_ids)} failed)")
+            return failed_ids
             
         except Exception as e:
             logger.error(f"Bulk indexing failed: {e}")
-            return 0
+            # Outcome unknown - report the whole batch as failed
+            return [doc['file_id'] for doc in documents]
     
-    def search(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
-        """Search for documents"""
+    def refresh_index(self) -> bool:
+        """Make all indexed documents searchable"""
         if not self.client:
             raise RuntimeError("Not connected. Call connect() first.")
         
         try:
-            # Build search query
-            # Match in extracted_text (main content) and file_name (boost results)
-            search_body = {
-                "query": {
-                    "multi_match": {
-                        "query": query,
-                        "fields": [
-                            "extracted_text",
-                            "file_name^2",  # Boost file name matches
-                            "file_path"
-                        ],
-                        "type": "best_fields",
-                        "fuzziness": "AUTO"
-                    }
-                },
-                "size": limit,
-                "_source": ["file_id", "file_name", "file_path", "url", "mime_type", "updated_time"],
-                "highlight": {
-                    "fields": {
-                        "extracted_text": {
-                            "fragment_size": 150,
-                            "number_of_fragments": 3
-                        }
+            self.client.indices.refresh(index=self.index_name)
+            return True
+        except Exception as e:
+            logger.error(f"Failed to refresh index: {e}")
+            return False
+    
+    @contextmanager
+    def bulk_mode(self):
+        """
+        Tune the index for heavy writes for the duration of the block.
+        Disables periodic refresh and replicas, then restores the original
+        settings and refreshes on exit.
+        """
+        if not self.client:
+            raise RuntimeError("Not connected. Call connect() first.")
+        
+        original = None
+        try:
+            response = self.client.indices.get_settings(
+                index=self.index_name,
+                name=["index.refresh_interval", "index.number_of_replicas"],
+                flat_settings=True
+            )
+            current = response.get(self.index_name, {}).get('settings', {})
+            # Unset values restore to None, which resets them to the default
+            original = {
+                "refresh_interval": current.get("index.refresh_interval"),
+                "number_of_replicas": current.get("index.number_of_replicas")
+            }
+            
+            self.client.indices.put_settings(
+                index=self.index_name,
+                settings={"index": {"refresh_interval": "-1", "number_of_replicas": 0}}
+            )
+            logger.info("Bulk mode enabled (refresh and replicas off)")
+        except Exception as e:
+            logger.warning(f"Could not enable bulk mode, continuing with current settings: {e}")
+        
+        try:
+            yield
+        finally:
+            if original is not None:
+                try:
+                    self.client.indices.put_settings(
+                        index=self.index_name,
+                        settings={"index": original}
+                    )
+                    logger.info("Bulk mode disabled (index settings restored)")
+                except Exception as e:
+                    logger.error(f"Failed to restore index settings {original}: {e}")
+            self.refresh_index()
+    
+    def force_merge(self, max_num_segments: int = 5) -> bool:
+        """Merge index segments after a large write (blocks until done)"""
+        if not self.client:
+            raise RuntimeError("Not connected. Call connect() first.")
+        
+        try:
+            # Merging can take minutes - don't apply the normal request timeout
+            self.client.options(request_timeout=None).indices.forcemerge(
+                index=self.index_name,
+                max_num_segments=max_num_segments
+            )
+            logger.info(f"Force-merged '{self.index_name}' to {max_num_segments} segments")
+            return True
+        except Exception as e:
+            logger.error(f"Force merge failed: {e}")
+            return False
+    
+    def _build_search_body(self, query: str, limit: int) -> Dict[str, Any]:
+        """Build the search request body for a query"""
+        # Match in extracted_text (main content) and file_name (boost results)
+        return {
+            "query": {
+                "multi_match": {
+                    "query": query,
+                    "fields": [
+                        "extracted_text",
+                        "file_name^2",  # Boost file name matches
+                        "file_path"
+                    ],
+                    "type": "best_fields",
+                    "fuzziness": "AUTO"
+                }
+            },
+            "size": limit,
+            "_source": ["file_id", "file_name", "file_path", "url", "mime_type", "updated_time"],
+            "highlight": {
+                "fields": {
+                    "extracted_text": {
+                        "fragment_size": 150,
+                        "number_of_fragments": 3
                     }
                 }
             }
+        }
+    
+    def _format_hits(self, response: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Convert a search response into result dicts"""
+        results = []
+        for hit in response['hits']['hits']:
+            result = {
+                'score': hit['_score'],
+                'file_id': hit['_source']['file_id'],
+                'file_name': hit['_source']['file_name'],
+                'file_path': hit['_source']['file_path'],
+                'url': hit['_source']['url'],
+                'mime_type': hit['_source']['mime_type'],
+                'updated_time': hit['_source']['updated_time']
+            }
             
+            # Add highlights if available
+            if 'highlight' in hit:
+                result['highlights'] = hit['highlight'].get('extracted_text', [])
+            
+            results.append(result)
+        
+        return results
+    
+    def search(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Search for documents"""
+        if not self.client:
+            raise RuntimeError("Not connected. Call connect() first.")
+        
+        try:
             # Execute search
+            search_body = self._build_search_body(query, limit)
             response = self.client.search(index=self.index_name, **search_body)
             
-            # Format results
-            results = []
-            for hit in response['hits']['hits']:
-                result = {
-                    'score': hit['_score'],
-                    'file_id': hit['_source']['file_id'],
-                    'file_name': hit['_source']['file_name'],
-                    'file_path': hit['_source']['file_path'],
-                    'url': hit['_source']['url'],
-                    'mime_type': hit['_source']['mime_type'],
-                    'updated_time': hit['_source']['updated_time']
-                }
-                
-                # Add highlights if available
-                if 'highlight' in hit:
-                    result['highlights'] = hit['highlight'].get('extracted_text', [])
-                
-                results.append(result)
-            
+            results = self._format_hits(response)
             logger.info(f"Found {len(results)} results for query: '{query}'")
             return results
             
@@ -213,6 +372,56 @@ class ElasticIndexer(BaseIndexer):
             logger.error(f"Search failed: {e}")
             return []
     
+    def multi_search(
+        self,
+        queries: List[Tuple[str, int]]
+    ) -> List[Union[List[Dict[str, Any]], SearchError]]:
+        """
+        Run several searches in a single _msearch request.
+        
+        Args:
+            queries: List of (query, limit) pairs
+            
+        Returns:
+            One entry per query, in the same order: its result list, or a
+            SearchError if that query failed on its own
+            
+        Raises:
+            SearchError: If the _msearch request itself failed
+        """
+        if not self.client:
+            raise RuntimeError("Not connected. Call connect() first.")
+        
+        if not queries:
+            return []
+        
+        # One header + body pair per query
+        searches = []
+        for query, limit in queries:
+            searches.append({"index": self.index_name})
+            searches.append(self._build_search_body(query, limit))
+        
+        try:
+            response = self.client.msearch(searches=searches)
+        except Exception as e:
+            logger.error(f"Multi-search failed: {e}")
+            raise SearchError(f"Multi-search failed: {e}") from e
+        
+        results = []
+        for (query, _), item in zip(queries, response['responses']):
+            if 'error' not in item:
+                results.append(self._format_hits(item))
+            elif item['error'].get('type') == 'index_not_found_exception':
+                # Same as search(): no index yet means no results
+                logger.warning(f"Index '{self.index_name}' not found")
+                results.append([])
+            else:
+                logger.error(f"Search failed for query '{query}': {item['error']}")
+                results.append(SearchError(f"Search failed: {item['error'].get('reason', item['error'])}"))
+        
+        logger.info(f"Ran {len(queries)} searches in one batch")
+        return results
+    
     def delete_document(self, file_id: str) -> bool:
         """Delete a document"""
         if not self.client:
@@ -220,15 +429,48 @@ class ElasticIndexer(BaseIndexer):
         
         try:
             self.client.delete(index=self.index_name, id=file_id, refresh='wait_for')
-            logger.debug(f"Deleted document: {file_id}")
+            logger.debug("Deleted document: %s", file_id)
             return True
         except es_exceptions.NotFoundError:
-            logger.warning(f"Document not found: {file_id}")
+            logger.warning("Document not found: %s", file_id)
             return False
         except Exception as e:
             logger.error(f"Failed to delete document: {e}")
             return False
     
+    def bulk_delete(self, file_ids: Iterable[str]) -> int:
+        """
+        Delete many documents via the bulk API (no refresh).
+        
+        Args:
+            file_ids: IDs of documents to delete
+            
+        Returns:
+            Number of documents deleted
+        """
+        if not self.client:
+            raise RuntimeError("Not connected. Call connect() first.")
+        
+        actions = (
+            {"_op_type": "delete", "_index": self.index_name, "_id": file_id}
+            for file_id in file_ids
+        )
+        
+        try:
+            # Missing documents come back as 404 and count as failed
+            deleted, failed = bulk(
+                self.client,
+                actions,
+                chunk_size=BULK_CHUNK_SIZE,
+                raise_on_error=False,
+                stats_only=True
+            )
+            logger.info(f"Bulk deleted {deleted} documents ({failed} not found or failed)")
+            return deleted
+        except Exception as e:
+            logger.error(f"Bulk delete failed: {e}")
+            return 0
+    
     def document_exists(self, file_id: str) -> bool:
         """Check if document exists"""
         if not self.client:
@@ -239,6 +481,30 @@ class ElasticIndexer(BaseIndexer):
         except Exception:
             return False
     
+    def documents_exist(self, file_ids: List[str]) -> Dict[str, bool]:
+        """
+        Check existence of many documents in a single mget request.
+        
+        Args:
+            file_ids: Document IDs to check
+            
+        Returns:
+            Dict mapping each ID to whether it is indexed
+        """
+        if not self.client:
+            raise RuntimeError("Not connected. Call connect() first.")
+        
+        if not file_ids:
+            return {}
+        
+        try:
+            # Existence bits only - skip fetching _source
+            response = self.client.mget(index=self.index_name, ids=file_ids, source=False)
+            return {doc['_id']: doc.get('found', False) for doc in response['docs']}
+        except Exception as e:
+            logger.error(f"Failed to check documents: {e}")
+            return {file_id: False for file_id in file_ids}
+    
     def get_document(self, file_id: str) -> Optional[Dict[str, Any]]:
         """Get document by ID"""
         if not self.client:
@@ -258,24 +524,35 @@ class ElasticIndexer(BaseIndexer):
         if not self.client:
             raise RuntimeError("Not connected. Call connect() first.")
         
+        pit_id = None
         try:
-            # Scroll through all documents
-            response = self.client.search(
-                index=self.index_name,
-                query={"match_all": {}},
-                source=False,
-                size=1000,
-                scroll='2m'
-            )
+            # Page through a point-in-time snapshot with search_after: no
+            # scroll context held per shard, and _shard_doc is the cheapest sort
+            pit_id = self.client.open_point_in_time(
+                index=self.index_name, keep_alive=PIT_KEEP_ALIVE
+            )['id']
             
-            file_ids = [hit['_id'] for hit in response['hits']['hits']]
-            
-            # Handle pagination
-            scroll_id = response.get('_scroll_id')
-            while scroll_id and len(response['hits']['hits']) > 0:
-                response = self.client.scroll(scroll_id=scroll_id, scroll='2m')
-                file_ids.extend([hit['_id'] for hit in response['hits']['hits']])
-                scroll_id = response.get('_scroll_id')
+            file_ids = []
+            search_after = None
+            while True:
+                response = self.client.search(
+                    pit={"id": pit_id, "keep_alive": PIT_KEEP_ALIVE},
+                    query={"match_all": {}},
+                    sort=[{"_shard_doc": "asc"}],
+                    source=False,
+                    size=ID_PAGE_SIZE,
+                    search_after=search_after,
+                    track_total_hits=False
+                )
+                hits = response['hits']['hits']
+                file_ids.extend(hit['_id'] for hit in hits)
+                
+                # The PIT id can change between requests
+                pit_id = response.get('pit_id', pit_id)
+                
+                if len(hits) < ID_PAGE_SIZE:
+                    break
+                search_after = hits[-1]['sort']
             
             return file_ids
             
@@ -284,6 +561,104 @@ class ElasticIndexer(BaseIndexer):
         except Exception as e:
             logger.error(f"Failed to get document IDs: {e}")
             return []
+        finally:
+            if pit_id:
+                try:
+                    self.client.close_point_in_time(id=pit_id)
+                except Exception:
+                    pass
+    
+    def mget_sync_state(self, file_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Fetch updated_time, name, path, content_hash and md5_checksum for many
+        documents with batched mget requests.
+        
+        Args:
+            file_ids: Document IDs to look up
+            
+        Returns:
+            Dict of file_id to {'updated_time': datetime, 'file_name': str,
+            'file_path': str, 'content_hash': str or None, 'md5_checksum': str or None}
+            for the IDs that are indexed
+        """
+        if not self.client:
+            raise RuntimeError("Not connected. Call connect() first.")
+        
+        sync_state = {}
+        try:
+            for start in range(0, len(file_ids), MGET_BATCH_SIZE):
+                response = self.client.mget(
+                    index=self.index_name,
+                    ids=file_ids[start:start + MGET_BATCH_SIZE],
+                    source_includes=["updated_time", "file_name", "file_path", "content_hash", "md5_checksum"]
+                )
+                for doc in response['docs']:
+                    if doc.get('found'):
+                        sync_state[doc['_id']] = {
+                            'updated_time': datetime.fromisoformat(doc['_source']['updated_time']),
+                            'file_name': doc['_source'].get('file_name'),
+                            'file_path': doc['_source'].get('file_path'),
+                            # Documents indexed before content hashing have none
+                            'content_hash': doc['_source'].get('content_hash'),
+                            'md5_checksum': doc['_source'].get('md5_checksum')
+                        }
+        except Exception as e:
+            logger.error(f"Failed to get sync state: {e}")
+        
+        return sync_state
+    
+    def bulk_update_metadata(self, updates: Dict[str, Dict[str, Any]]) -> int:
+        """
+        Update fields on many documents via partial bulk updates (no refresh).
+        Datetimes are serialized to ISO strings by the client serializer.
+        Used when a file changed (modified time, name, path) but its content did not.
+        
+        Args:
+            updates: Dict of file_id to the fields to overwrite
+            
+        Returns:
+            Number of documents updated
+        """
+        if not self.client:
+            raise RuntimeError("Not connected. Call connect() first.")
+        
+        actions = (
+            {
+                "_op_type": "update",
+                "_index": self.index_name,
+                "_id": file_id,
+                "doc": fields
+            }
+            for file_id, fields in updates.items()
+        )
+        
+        try:
+            updated, failed = bulk(
+                self.client,
+                actions,
+                chunk_size=BULK_CHUNK_SIZE,
+                raise_on_error=False,
+                stats_only=True
+            )
+            if failed:
+                logger.warning(f"Failed to update metadata on {failed} documents")
+            return updated
+        except Exception as e:
+            logger.error(f"Bulk update failed: {e}")
+            return 0
+    
+    def count_documents(self) -> int:
+        """Count documents without fetching their IDs"""
+        if not self.client:
+            raise RuntimeError("Not connected. Call connect() first.")
+        
+        try:
+            return self.client.count(index=self.index_name)['count']
+        except es_exceptions.NotFoundError:
+            return 0
+        except Exception as e:
+            logger.error(f"Failed to count documents: {e}")
+            return 0
     
     def delete_index(self) -> bool:
         """Delete the entire index"""
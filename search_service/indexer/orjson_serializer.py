@@ -0,0 +1,23 @@
+"""
+orjson-backed serializers for the Elasticsearch client.
+Bulk bodies carry full extracted_text fields, where stdlib json dominates CPU.
+"""
+from typing import Dict
+
+from elastic_transport import NdjsonSerializer, OrjsonSerializer, Serializer
+
+
+class OrjsonNdjsonSerializer(NdjsonSerializer, OrjsonSerializer):
+    """NDJSON bodies (_bulk, _msearch): upstream line handling, orjson per line"""
+
+
+def orjson_serializers() -> Dict[str, Serializer]:
+    """
+    Build the serializers mapping for Elasticsearch(serializers=...).
+    The client reuses these for the compatibility-mode MIME types too.
+    
+    Returns:
+        Dict of MIME type to serializer instance
+    """
+    serializers = [OrjsonSerializer(), OrjsonNdjsonSerializer()]
+    return {serializer.mimetype: serializer for serializer in serializers}
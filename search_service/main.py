@@ -6,26 +6,39 @@ Features:
 - Downloads files from Google Drive
 - Extracts text from supported formats
 - Indexes in Elasticsearch
-- Incremental indexing (only re-index if modified)
+- Incremental indexing (only changes since the last sync, via the Drive changes API)
 - Deletion sync (removes deleted files from index)
 
 Usage:
     python -m search_service.main                    # Run full sync
     python -m search_service.main --incremental      # Only index new/modified
     python -m search_service.main --clean            # Delete index and re-index all
+    python -m search_service.main --workers 16       # Process 16 files concurrently
+    python -m search_service.main --bulk-size 1000   # Documents per bulk request
 """
+import os
 import sys
+import json
+import queue
 import logging
 import argparse
-from datetime import datetime
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from tqdm import tqdm
+from tqdm.contrib.logging import logging_redirect_tqdm
 
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from search_service.config import settings
+from search_service.cloud.base_client import CloudFile, content_hash
 from search_service.cloud.drive_client import DriveClient
-from search_service.extractor.extractor_factory import ExtractorFactory
+from search_service.extractor.extractor_factory import ExtractorFactory, extract_in_worker
 from search_service.indexer.elastic_indexer import ElasticIndexer
 
 # Configure logging
@@ -35,18 +48,66 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Only force-merge after syncs that wrote at least this many documents
+FORCE_MERGE_MIN_DOCS = 1000
+
+# Files extracted or in extraction, waiting to be indexed
+PIPELINE_QUEUE_SIZE = 64
+
+# Extraction pools started again after a worker crash, before giving up
+EXTRACT_POOL_MAX_RESTARTS = 3
+
+# Stats that mark a file as finished (advance the progress bar)
+FILE_OUTCOMES = ('indexed', 'updated', 'skipped', 'errors')
+PROGRESS_POSTFIX_EVERY = 100
+
+
+def _file_metadata(file: CloudFile) -> Dict[str, Any]:
+    """
+    Indexed fields that come from Drive metadata rather than file content.
+    
+    Args:
+        file: File as listed by Drive
+    
+    Returns:
+        Document fields (without file_id, extracted_text and content_hash)
+    """
+    return {
+        'file_name': file.name,
+        'file_path': file.path,
+        'url': file.url,
+        'mime_type': file.mime_type,
+        # Left as a datetime: the orjson serializer writes the same
+        # ISO string natively, several times faster than isoformat()
+        'updated_time': file.modified_time,
+        'md5_checksum': file.md5_checksum,
+        'size': file.size
+    }
+
 
 class DocumentIndexer:
     """Orchestrates the document indexing pipeline"""
     
-    def __init__(self, incremental: bool = False):
+    def __init__(
+        self,
+        incremental: bool = False,
+        workers: Optional[int] = None,
+        bulk_size: Optional[int] = None,
+        bulk_bytes: Optional[int] = None
+    ):
         """
         Initialize indexer components.
         
         Args:
             incremental: If True, only index new/modified files
+            workers: Files downloaded/extracted concurrently (default: settings.sync_workers)
+            bulk_size: Documents per bulk request (default: settings.sync_bulk_size)
+            bulk_bytes: Maximum bulk request size in bytes (default: settings.sync_bulk_bytes)
         """
         self.incremental = incremental
+        self.workers = workers or settings.sync_workers
+        self.bulk_size = bulk_size or settings.sync_bulk_size
+        self.bulk_bytes = bulk_bytes or settings.sync_bulk_bytes
         self.drive_client = DriveClient()
         self.extractor_factory = ExtractorFactory(include_ocr=False)
         self.indexer = ElasticIndexer()
@@ -59,9 +120,18 @@ class DocumentIndexer:
             'deleted': 0,
             'errors': 0
         }
+        self._stats_lock = threading.Lock()
+        self._progress: Optional[tqdm] = None
+        # Whether total_files counts only files from the Drive changes feed
+        self._listed_changes = False
     
-    def connect(self) -> bool:
-        """Connect to all services"""
+    def connect(self, interactive: bool = True) -> bool:
+        """
+        Connect to all services.
+        
+        Args:
+            interactive: Allow the browser OAuth flow if there is no usable token
+        """
         logger.info("=" * 70)
         logger.info("Document Search - Indexing Pipeline")
         logger.info("=" * 70)
@@ -79,7 +149,7 @@ class DocumentIndexer:
         
         # Authenticate with Drive
         logger.info("\n[3] Authenticating with Google Drive...")
-        if not self.drive_client.authenticate():
+        if not self.drive_client.authenticate(interactive=interactive):
             logger.error("Failed to authenticate with Google Drive")
             return False
         
@@ -87,111 +157,459 @@ class DocumentIndexer:
     
     def sync_files(self):
         """Main synchronization logic"""
-        logger.info(f"\n[4] Listing files from Drive folder: {settings.google_drive_folder_id}")
-        
         try:
-            # Get files from Drive
-            drive_files = self.drive_client.list_files()
-            self.stats['total_files'] = len(drive_files)
+            # Incremental mode lists only what changed since the last sync;
+            # a full listing is the fallback whenever that isn't possible
+            listing = self._list_changed_files() if self.incremental else None
+            self._listed_changes = listing is not None
+            if listing is None:
+                listing = self._list_all_files()
+            drive_files, indexed_file_ids, deleted_file_ids, new_sync_state = listing
             
-            logger.info(f"Found {len(drive_files)} files in Drive")
+            # Deletion sync: remove files deleted from Drive
+            if deleted_file_ids:
+                logger.info(f"\n[5] Found {len(deleted_file_ids)} deleted files to remove from index")
+                self.stats['deleted'] += self.indexer.bulk_delete(deleted_file_ids)
             
-            if not drive_files:
-                logger.warning("No files to index!")
-                return
+            if drive_files:
+                self._process_files(drive_files, indexed_file_ids)
+            else:
+                logger.info("No files to index")
             
-            # Get currently indexed file IDs
-            indexed_file_ids = set(self.indexer.get_all_document_ids())
-            drive_file_ids = {f.file_id for f in drive_files}
+            # Make everything indexed above searchable
+            if self.stats['indexed'] or self.stats['updated'] or self.stats['deleted']:
+                self.indexer.refresh_index()
             
-            # Deletion sync: Find files that were deleted from Drive
-            deleted_file_ids = indexed_file_ids - drive_file_ids
-            if deleted_file_ids:
-                logger.info(f"\n[5] Found {len(deleted_file_ids)} deleted files to remove from index")
-                for file_id in deleted_file_ids:
-                    if self.indexer.delete_document(file_id):
-                        self.stats['deleted'] += 1
-                        logger.info(f"  Removed deleted file: {file_id}")
+            # Only advance the change token once every change made it in -
+            # otherwise the next incremental sync would never see failed files again
+            if new_sync_state is not None and not self.stats['errors']:
+                self._save_sync_state(new_sync_state)
+            elif new_sync_state is not None:
+                logger.warning("Sync had errors; keeping the previous change token")
+        
+        except Exception as e:
+            logger.error(f"Sync failed: {e}", exc_info=True)
+    
+    def _list_all_files(self) -> Tuple[List[CloudFile], Set[str], Set[str], Optional[Dict[str, Any]]]:
+        """
+        List every file in the Drive folder and diff against the index.
+        
+        Returns:
+            (files, indexed file IDs, IDs to delete, sync state to save or None)
+        """
+        logger.info(f"\n[4] Listing files from Drive folder: {settings.google_drive_folder_id}")
+        
+        # Taken before listing so changes made during it are seen next time
+        try:
+            start_token = self.drive_client.get_start_page_token()
+        except Exception as e:
+            logger.warning(f"Could not get a Drive change token, next sync will be a full listing: {e}")
+            start_token = None
+        
+        # Get files from Drive (deletion sync needs the complete listing)
+        folders: Dict[str, str] = {}
+        drive_files = list(self.drive_client.list_files(folders=folders))
+        self.stats['total_files'] = len(drive_files)
+        
+        logger.info(f"Found {len(drive_files)} files in Drive")
+        
+        # Files in the index but no longer in Drive were deleted
+        indexed_file_ids = set(self.indexer.get_all_document_ids())
+        deleted_file_ids = indexed_file_ids - {f.file_id for f in drive_files}
+        
+        sync_state = None
+        if start_token:
+            sync_state = {
+                'folder_id': settings.google_drive_folder_id,
+                'page_token': start_token,
+                'folders': folders
+            }
+        
+        return drive_files, indexed_file_ids, deleted_file_ids, sync_state
+    
+    def _list_changed_files(self) -> Optional[Tuple[List[CloudFile], Set[str], Set[str], Dict[str, Any]]]:
+        """
+        List only the files changed since the last successful sync.
+        
+        Returns:
+            (changed files, indexed file IDs among them, IDs to delete, sync state
+            to save), or None if a full listing is needed
+        """
+        sync_state = self._load_sync_state()
+        if not sync_state or sync_state.get('folder_id') != settings.google_drive_folder_id:
+            logger.info("No change token for this folder yet - doing a full listing")
+            return None
+        
+        # An empty index means the state the token was taken against is gone
+        if not self.indexer.count_documents():
+            logger.info("Index is empty - doing a full listing")
+            return None
+        
+        logger.info("\n[4] Listing changes in Drive since the last sync...")
+        result = self.drive_client.list_changes(sync_state['page_token'], sync_state['folders'])
+        if result is None:
+            return None
+        changes, page_token = result
+        
+        # One mget tells updates from new files and which removals are indexed
+        exists = self.indexer.documents_exist([change.file_id for change in changes])
+        indexed_file_ids = {file_id for file_id, found in exists.items() if found}
+        
+        drive_files = [change.file for change in changes if change.file is not None]
+        deleted_file_ids = {
+            change.file_id for change in changes if change.file is None
+        } & indexed_file_ids
+        self.stats['total_files'] = len(drive_files)
+        
+        logger.info(f"Found {len(drive_files)} changed files in Drive")
+        
+        return drive_files, indexed_file_ids, deleted_file_ids, {**sync_state, 'page_token': page_token}
+    
+    def _load_sync_state(self) -> Optional[Dict[str, Any]]:
+        """Read the change token and folder tree saved by the last sync"""
+        path = Path(settings.sync_state_file)
+        if not path.exists():
+            return None
+        
+        try:
+            sync_state = json.loads(path.read_text())
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable sync state {path}: {e}")
+            return None
+        
+        if (
+            not isinstance(sync_state, dict)
+            or not isinstance(sync_state.get('page_token'), str)
+            or not isinstance(sync_state.get('folders'), dict)
+        ):
+            logger.warning(f"Ignoring incomplete sync state {path}")
+            return None
+        return sync_state
+    
+    def _save_sync_state(self, sync_state: Dict[str, Any]):
+        """Write the sync state atomically (a crash never leaves half a file)"""
+        path = Path(settings.sync_state_file)
+        tmp_path = path.with_name(path.name + ".tmp")
+        try:
+            tmp_path.write_text(json.dumps(sync_state))
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning(f"Could not save sync state {path}: {e}")
+    
+    def _process_files(self, drive_files: List[CloudFile], indexed_file_ids: Set[str]):
+        """
+        Download, extract and index files.
+        
+        Args:
+            drive_files: Files to (re-)index if supported and changed
+            indexed_file_ids: IDs already in the index (to tell updates from new docs)
+        """
+        drive_file_ids = {f.file_id for f in drive_files}
+        
+        # Incremental mode: one batched lookup instead of a GET per file.
+        # Only files already in the index can have a stored updated_time.
+        sync_state: Dict[str, Dict[str, Any]] = {}
+        if self.incremental:
+            sync_state = self.indexer.mget_sync_state(
+                list(drive_file_ids & indexed_file_ids)
+            )
+        
+        # Three-stage pipeline: download threads -> extraction processes ->
+        # bulk indexing on this thread. The bounded queue between them
+        # applies backpressure so a slow stage caps memory, not grows it.
+        extract_workers = settings.sync_extract_workers or os.cpu_count()
+        logger.info(
+            f"\n[6] Processing files ({self.workers} download workers, "
+            f"{extract_workers} extract processes)...\n"
+        )
+        
+        extracted: queue.Queue = queue.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+        unchanged: Dict[str, Dict[str, Any]] = {}
+        finished_before = sum(self.stats[key] for key in FILE_OUTCOMES)
+        
+        # Progress goes to a bar instead of per-file log lines; warnings
+        # and errors are still logged, printed above the bar.
+        # disable=None turns the bar off when stderr is not a terminal.
+        with logging_redirect_tqdm(), tqdm(
+            total=len(drive_files), desc="Indexing", unit="file", disable=None
+        ) as progress:
+            self._progress = progress
+            try:
+                with self._extract_pool(extract_workers) as extract_pool:
+                    stop = threading.Event()
+                    downloader = threading.Thread(
+                        target=self._download_stage,
+                        args=(drive_files, sync_state, extract_pool, extract_workers, extracted, unchanged, stop),
+                        name="sync-download",
+                        daemon=True
+                    )
+                    downloader.start()
+                    try:
+                        self._index_stage(extracted, indexed_file_ids)
+                    except BaseException:
+                        # The downloader may be blocked on the full queue: tell it
+                        # to stop and drain until its final None so it can exit
+                        stop.set()
+                        while (item := extracted.get()) is not None:
+                            item[2].cancel()
+                        raise
+                    finally:
+                        downloader.join()
+                progress.set_postfix(self._outcomes())
+            finally:
+                self._progress = None
+        
+        # Files the pipeline dropped (e.g. after the extraction pool kept
+        # crashing) must still show up as failed, not vanish from the totals
+        unfinished = len(drive_files) - (sum(self.stats[key] for key in FILE_OUTCOMES) - finished_before)
+        if unfinished > 0:
+            logger.error("%d files were not processed, counting them as errors", unfinished)
+            self._count('errors', unfinished)
+        
+        # Modified but byte-identical files: only refresh their metadata -
+        # a renamed or moved file keeps its text but needs the new name/path,
+        # and the new updated_time lets the next sync skip it before download
+        if unchanged:
+            self.indexer.bulk_update_metadata(unchanged)
+    
+    def _extract_pool(self, max_workers: int) -> ProcessPoolExecutor:
+        """
+        Create the extraction process pool.
+        Workers fork from a forkserver with the extractor modules preloaded:
+        no per-worker re-import, and no fork() of this (threaded) process.
+        """
+        if 'forkserver' in multiprocessing.get_all_start_methods():
+            context = multiprocessing.get_context('forkserver')
+            context.set_forkserver_preload(['search_service.extractor.extractor_factory'])
+        else:
+            context = multiprocessing.get_context('spawn')
+        return ProcessPoolExecutor(max_workers=max_workers, mp_context=context)
+    
+    def _count(self, key: str, n: int = 1):
+        """Update a stat (pipeline stages run on different threads)"""
+        with self._stats_lock:
+            self.stats[key] += n
             
-            # Process each file
-            logger.info(f"\n[6] Processing files...\n")
+            if self._progress is not None and key in FILE_OUTCOMES:
+                done = self._progress.n
+                self._progress.update(n)
+                if (done + n) // PROGRESS_POSTFIX_EVERY != done // PROGRESS_POSTFIX_EVERY:
+                    self._progress.set_postfix(self._outcomes(), refresh=False)
+    
+    def _outcomes(self) -> Dict[str, int]:
+        """Per-outcome file counts for the progress bar"""
+        return {key: self.stats[key] for key in FILE_OUTCOMES}
+    
+    def _files_to_index(
+        self,
+        files: List[CloudFile],
+        sync_state: Dict[str, Dict[str, Any]],
+        unchanged: Dict[str, Dict[str, Any]]
+    ) -> Iterator[CloudFile]:
+        """Yield files that are supported and (in incremental mode) changed"""
+        for file in files:
+            # Check if file is supported (single registry lookup, no extra logging)
+            if self.extractor_factory.resolve(file.mime_type, file.name) is None:
+                logger.warning("  %s: Unsupported file type, skipping", file.name)
+                self._count('skipped')
+                continue
             
-            for i, file in enumerate(drive_files, 1):
-                logger.info(f"[{i}/{len(drive_files)}] {file.name}")
+            # Incremental indexing: Check if file needs update.
+            # Renames and moves don't touch modifiedTime, so name and path must match too
+            if self.incremental:
+                existing = sync_state.get(file.file_id)
+                if (existing and file.modified_time <= existing['updated_time']
+                        and file.name == existing['file_name'] and file.path == existing['file_path']):
+                    logger.debug("  %s: Already up-to-date, skipping", file.name)
+                    self._count('skipped')
+                    continue
                 
-                try:
-                    # Check if file is supported
-                    if not self.extractor_factory.is_supported(file.mime_type, file.name):
-                        logger.warning(f"  Unsupported file type, skipping")
-                        self.stats['skipped'] += 1
-                        continue
-                    
-                    # Incremental indexing: Check if file needs update
-                    if self.incremental:
-                        existing_doc = self.indexer.get_document(file.file_id)
-                        if existing_doc:
-                            existing_time = datetime.fromisoformat(existing_doc['updated_time'])
-                            if file.modified_time <= existing_time:
-                                logger.info(f"  Already up-to-date, skipping")
-                                self.stats['skipped'] += 1
-                                continue
-                    
-                    # Download file
-                    logger.info(f"  Downloading...")
-                    content = self.drive_client.download_file(file.file_id)
-                    
-                    # Extract text
-                    logger.info(f"  Extracting text...")
-                    text = self.extractor_factory.extract_text(
-                        content, file.mime_type, file.name
-                    )
-                    
-                    if not text:
-                        logger.warning(f"  No text extracted, skipping")
-                        self.stats['skipped'] += 1
-                        continue
-                    
-                    # Prepare document
-                    document = {
-                        'file_id': file.file_id,
-                        'file_name': file.name,
-                        'file_path': file.path,
-                        'url': file.url,
-                        'mime_type': file.mime_type,
-                        'extracted_text': text,
-                        'updated_time': file.modified_time.isoformat(),
-                        'size': file.size
-                    }
-                    
-                    # Index document
-                    logger.info(f"  Indexing...")
-                    is_update = file.file_id in indexed_file_ids
-                    
-                    if self.indexer.index_document(document):
-                        if is_update:
-                            logger.info(f"  Updated ({len(text)} chars)")
-                            self.stats['updated'] += 1
-                        else:
-                            logger.info(f"  Indexed ({len(text)} chars)")
-                            self.stats['indexed'] += 1
-                    else:
-                        logger.error(f"  Indexing failed")
-                        self.stats['errors'] += 1
-                    
-                except Exception as e:
-                    logger.error(f"  Error: {e}")
-                    self.stats['errors'] += 1
+                # Drive's checksum matches the indexed one: same bytes, no download needed
+                if existing and file.md5_checksum and existing['md5_checksum'] == file.md5_checksum:
+                    logger.debug("  %s: Content unchanged, skipping", file.name)
+                    unchanged[file.file_id] = _file_metadata(file)
+                    self._count('skipped')
                     continue
             
+            yield file
+    
+    def _download_stage(
+        self,
+        files: List[CloudFile],
+        sync_state: Dict[str, Dict[str, Any]],
+        extract_pool: ProcessPoolExecutor,
+        extract_workers: int,
+        out: queue.Queue,
+        unchanged: Dict[str, Dict[str, Any]],
+        stop: threading.Event
+    ):
+        """
+        Stage 1: download files concurrently and hand them to the extraction pool.
+        Puts (file, content hash, extraction future) on the queue, then None when done.
+        In incremental mode, files whose content hash matches the indexed one are
+        not extracted; their metadata is recorded in unchanged instead.
+        A crashed extraction process breaks the pool; it is replaced (up to
+        EXTRACT_POOL_MAX_RESTARTS times) so one bad file can't stop the sync.
+        Stops early once stop is set (the index stage failed).
+        """
+        # Pools started here after a crash - shut down once everything is queued
+        restarted_pools: List[ProcessPoolExecutor] = []
+        downloads = None
+        try:
+            downloads = self.drive_client.download_many(
+                self._files_to_index(files, sync_state, unchanged),
+                max_workers=self.workers,
+                spool_threshold=settings.sync_spool_bytes or None
+            )
+            for file, content in downloads:
+                if stop.is_set():
+                    if content is not None and not isinstance(content, bytes):
+                        content.close()
+                    break
+                
+                if content is None:
+                    # Already logged by the Drive client
+                    self._count('errors')
+                    continue
+                
+                # Large files arrive as temp files; workers open them by path
+                spool = None if isinstance(content, bytes) else content
+                
+                # Compare before extraction so no-op updates cost no parse
+                digest = content_hash(content)
+                existing = sync_state.get(file.file_id)
+                if existing and existing['content_hash'] == digest:
+                    logger.debug("  %s: Content unchanged, skipping", file.name)
+                    unchanged[file.file_id] = _file_metadata(file)
+                    self._count('skipped')
+                    if spool:
+                        spool.close()
+                    continue
+                
+                logger.debug("  %s: Downloaded, extracting text...", file.name)
+                while True:
+                    try:
+                        future = extract_pool.submit(
+                            extract_in_worker,
+                            spool.name if spool else content,
+                            file.mime_type,
+                            file.name,
+                            digest=digest,
+                            cache_dir=settings.extract_cache_dir or None,
+                            cache_bytes=settings.extract_cache_bytes
+                        )
+                        break
+                    except BrokenProcessPool:
+                        if len(restarted_pools) >= EXTRACT_POOL_MAX_RESTARTS:
+                            if spool:
+                                spool.close()
+                            raise
+                        logger.error(
+                            "Extraction process crashed; restarting the extraction pool (%d/%d)",
+                            len(restarted_pools) + 1, EXTRACT_POOL_MAX_RESTARTS
+                        )
+                        extract_pool = self._extract_pool(extract_workers)
+                        restarted_pools.append(extract_pool)
+                
+                if spool:
+                    # Closing deletes the temp file - only once the worker is done with it
+                    future.add_done_callback(lambda _, spool=spool: spool.close())
+                out.put((file, digest, future))
+        except BrokenProcessPool:
+            logger.error(
+                "Extraction pool crashed again after %d restarts; stopping - "
+                "the remaining files are counted as errors", EXTRACT_POOL_MAX_RESTARTS
+            )
         except Exception as e:
-            logger.error(f"Sync failed: {e}", exc_info=True)
+            logger.error(f"Download stage failed: {e}", exc_info=True)
+        finally:
+            if downloads is not None:
+                # Stops queued downloads if we stopped early
+                downloads.close()
+            out.put(None)
+            for pool in restarted_pools:
+                pool.shutdown(wait=True)
+    
+    def _index_stage(self, extracted: queue.Queue, indexed_file_ids: Set[str]):
+        """
+        Stage 3: collect extraction results and bulk index them in batches.
+        
+        Args:
+            extracted: Queue of (file, content hash, extraction future), terminated by None
+            indexed_file_ids: IDs already in the index (to tell updates from new docs)
+        """
+        pending: List[Dict[str, Any]] = []
+        pending_bytes = 0
+        
+        while (item := extracted.get()) is not None:
+            file, digest, future = item
+            
+            try:
+                text = future.result()
+            except BrokenProcessPool:
+                # Lost with the worker that crashed - this file or one extracted alongside it
+                logger.error("  %s: Extraction process crashed", file.name)
+                self._count('errors')
+                continue
+            except Exception as e:
+                logger.error("  %s: Error: %s", file.name, e)
+                self._count('errors')
+                continue
+            
+            if not text:
+                logger.warning("  %s: No text extracted, skipping", file.name)
+                self._count('skipped')
+                continue
+            
+            logger.debug("  %s: Extracted %d chars", file.name, len(text))
+            
+            # Queue for the next bulk request
+            pending.append({
+                'file_id': file.file_id,
+                **_file_metadata(file),
+                'extracted_text': text,
+                'content_hash': digest
+            })
+            pending_bytes += len(text)
+            if len(pending) >= self.bulk_size or pending_bytes >= self.bulk_bytes:
+                self._flush(pending, indexed_file_ids)
+                pending = []
+                pending_bytes = 0
+        
+        # Index whatever is left
+        if pending:
+            self._flush(pending, indexed_file_ids)
+    
+    def _flush(self, documents: List[Dict[str, Any]], indexed_file_ids: Set[str]):
+        """
+        Bulk index a batch of documents and update stats.
+        
+        Args:
+            documents: Documents to index
+            indexed_file_ids: IDs already in the index (to tell updates from new docs)
+        """
+        logger.debug("  Bulk indexing %d documents...", len(documents))
+        failed_ids = set(self.indexer.bulk_index_documents(
+            documents, chunk_size=self.bulk_size, max_chunk_bytes=self.bulk_bytes
+        ))
+        
+        updated = sum(
+            1 for document in documents
+            if document['file_id'] in indexed_file_ids and document['file_id'] not in failed_ids
+        )
+        self._count('errors', len(failed_ids))
+        self._count('updated', updated)
+        self._count('indexed', len(documents) - len(failed_ids) - updated)
     
     def print_summary(self):
         """Print final summary"""
         logger.info("\n" + "=" * 70)
         logger.info("Sync Complete - Summary")
         logger.info("=" * 70)
-        logger.info(f"Total files in Drive:  {self.stats['total_files']}")
+        if self._listed_changes:
+            logger.info(f"Changed files in Drive: {self.stats['total_files']}")
+        else:
+            logger.info(f"Total files in Drive:  {self.stats['total_files']}")
         logger.info(f"Newly indexed:         {self.stats['indexed']}")
         logger.info(f"Updated:               {self.stats['updated']}")
         logger.info(f"Skipped:               {self.stats['skipped']}")
@@ -204,12 +622,21 @@ class DocumentIndexer:
         else:
             logger.info("Sync completed successfully!")
     
+    def sync(self):
+        """Sync files with the index tuned for bulk writes"""
+        with self.indexer.bulk_mode():
+            self.sync_files()
+        
+        # Compact the segments left behind by a large write
+        if self.stats['indexed'] + self.stats['updated'] >= FORCE_MERGE_MIN_DOCS:
+            self.indexer.force_merge()
+    
     def run(self):
         """Execute the full indexing pipeline"""
         if not self.connect():
             sys.exit(1)
         
-        self.sync_files()
+        self.sync()
         self.print_summary()
 
 
@@ -228,6 +655,24 @@ def main():
         action='store_true',
         help='Delete existing index and re-index all files'
     )
+    parser.add_argument(
+        '--workers', '-w',
+        type=int,
+        default=None,
+        help=f'Files to download/extract concurrently (default: {settings.sync_workers})'
+    )
+    parser.add_argument(
+        '--bulk-size',
+        type=int,
+        default=None,
+        help=f'Documents per bulk index request (default: {settings.sync_bulk_size})'
+    )
+    parser.add_argument(
+        '--bulk-bytes',
+        type=int,
+        default=None,
+        help=f'Maximum bulk request size in bytes (default: {settings.sync_bulk_bytes})'
+    )
     
     args = parser.parse_args()
     
@@ -237,13 +682,20 @@ def main():
         indexer = ElasticIndexer()
         if indexer.connect():
             indexer.delete_index()
+            # The saved change token refers to the deleted index
+            Path(settings.sync_state_file).unlink(missing_ok=True)
             logger.info("Index deleted")
         else:
             logger.error("Failed to connect to Elasticsearch")
             sys.exit(1)
     
     # Run indexing
-    indexer = DocumentIndexer(incremental=args.incremental)
+    indexer = DocumentIndexer(
+        incremental=args.incremental,
+        workers=args.workers,
+        bulk_size=args.bulk_size,
+        bulk_bytes=args.bulk_bytes
+    )
     
     if args.incremental:
         logger.info("Running in incremental mode - only new/modified files will be indexed")
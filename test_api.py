@@ -5,9 +5,38 @@ Tests the /search endpoint with sample queries.
 import requests
 import json
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 API_BASE_URL = "http://localhost:8000"
 
+# Searches in the sweep run concurrently
+SEARCH_WORKERS = 5
+
+_local = threading.local()
+
+
+def get_session() -> requests.Session:
+    """
+    Get this thread's session.
+    requests.Session isn't thread-safe, so each thread reuses its own
+    keep-alive connection rather than sharing one.
+    """
+    session = getattr(_local, 'session', None)
+    if session is None:
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=1,
+            max_retries=Retry(total=3, backoff_factor=0.2)
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        _local.session = session
+    return session
+
 
 def test_health():
     """Test health endpoint"""
@@ -16,7 +45,7 @@ def test_health():
     print("=" * 60)
     
     try:
-        response = requests.get(f"{API_BASE_URL}/health")
+        response = get_session().get(f"{API_BASE_URL}/health")
         print(f"Status Code: {response.status_code}")
         print(f"Response:\n{json.dumps(response.json(), indent=2)}\n")
         return response.status_code == 200
@@ -27,40 +56,47 @@ def test_health():
 
 def test_search(query: str, limit: int = 10):
     """Test search endpoint"""
-    print("=" * 60)
-    print(f"Search Query: '{query}' (limit={limit})")
-    print("=" * 60)
+    # Print the whole report at once - searches may run concurrently
+    lines = []
+    out = lines.append
+    
+    out("=" * 60)
+    out(f"Search Query: '{query}' (limit={limit})")
+    out("=" * 60)
     
     try:
-        response = requests.get(
+        response = get_session().get(
             f"{API_BASE_URL}/search",
             params={"q": query, "limit": limit}
         )
         
-        print(f"Status Code: {response.status_code}")
+        out(f"Status Code: {response.status_code}")
         
         if response.status_code == 200:
             data = response.json()
-            print(f"Total Results: {data['total_results']}\n")
+            out(f"Total Results: {data['total_results']}\n")
             
             for i, result in enumerate(data['results'], 1):
-                print(f"{i}. {result['file_name']} (score: {result['score']})")
-                print(f"   Path: {result['file_path']}")
-                print(f"   URL: {result['url']}")
-                print(f"   Type: {result['mime_type']}")
+                out(f"{i}. {result['file_name']} (score: {result['score']})")
+                out(f"   Path: {result['file_path']}")
+                out(f"   URL: {result['url']}")
+                out(f"   Type: {result['mime_type']}")
                 
                 if result.get('highlights'):
-                    print(f"   Match: {result['highlights'][0][:100]}...")
-                print()
+                    out(f"   Match: {result['highlights'][0][:100]}...")
+                out("")
             
-            return True
+            ok = True
         else:
-            print(f"Error: {response.text}\n")
-            return False
+            out(f"Error: {response.text}\n")
+            ok = False
             
     except Exception as e:
-        print(f"Error: {e}\n")
-        return False
+        out(f"Error: {e}\n")
+        ok = False
+    
+    print("\n".join(lines))
+    return ok
 
 
 def test_stats():
@@ -70,7 +106,7 @@ def test_stats():
     print("=" * 60)
     
     try:
-        response = requests.get(f"{API_BASE_URL}/stats")
+        response = get_session().get(f"{API_BASE_URL}/stats")
         print(f"Status Code: {response.status_code}")
         print(f"Response:\n{json.dumps(response.json(), indent=2)}\n")
         return response.status_code == 200
@@ -87,7 +123,7 @@ def main():
     
     # Check if API is running
     try:
-        requests.get(f"{API_BASE_URL}/", timeout=2)
+        get_session().get(f"{API_BASE_URL}/", timeout=2)
     except requests.exceptions.ConnectionError:
         print("Error: API server is not running!")
         print("\nStart the server with:")
@@ -109,8 +145,9 @@ def main():
         ("elasticsearch", 5),
     ]
     
-    for query, limit in test_queries:
-        test_search(query, limit)
+    # Independent searches - wall time is the slowest one, not the sum
+    with ThreadPoolExecutor(max_workers=SEARCH_WORKERS) as executor:
+        list(executor.map(lambda params: test_search(*params), test_queries))
     
     print("=" * 60)
     print("All API tests complete!")
@@ -0,0 +1,275 @@
+"""
+Offline tests for the search API: request batching and the HTTP endpoints.
+Elasticsearch is replaced by a fake indexer. test_api.py exercises a
+running server instead.
+
+Usage:
+    pytest test_app.py
+    python test_app.py
+"""
+import sys
+import asyncio
+import threading
+from typing import List, Tuple
+
+import pytest
+from fastapi.testclient import TestClient
+
+from search_service.api import app as api
+from search_service.api.search_batcher import SearchBatcher
+from search_service.indexer.elastic_indexer import SearchError
+
+
+def make_result(file_name: str) -> dict:
+    """A search result as returned by ElasticIndexer"""
+    return {
+        'score': 1.0,
+        'file_id': file_name,
+        'file_name': file_name,
+        'file_path': f"/{file_name}",
+        'url': f"https://drive.google.com/{file_name}",
+        'mime_type': 'text/plain',
+        'updated_time': "2024-01-01T00:00:00+00:00",
+        'highlights': []
+    }
+
+
+class FakeIndexer:
+    """Answers multi_search with one result named after each query"""
+    
+    def __init__(self):
+        self.batches: List[List[Tuple[str, int]]] = []
+        self.error = None
+        self.failing_queries = set()
+        self.lock = threading.Lock()
+    
+    def multi_search(self, queries):
+        with self.lock:
+            self.batches.append(list(queries))
+        if self.error:
+            raise self.error
+        return [
+            SearchError(f"Search failed: {query}") if query in self.failing_queries
+            else [make_result(f"{query}.txt")]
+            for query, _ in queries
+        ]
+
+
+def run_batched(indexer: FakeIndexer, queries: List[str], **kwargs) -> list:
+    """Submit queries concurrently through a batcher; exceptions are returned"""
+    async def main():
+        batcher = SearchBatcher(indexer, **kwargs)
+        batcher.start()
+        try:
+            return await asyncio.gather(
+                *(batcher.submit(query, 10) for query in queries),
+                return_exceptions=True
+            )
+        finally:
+            await batcher.stop()
+    
+    return asyncio.run(main())
+
+
+def test_batcher_coalesces_concurrent_searches():
+    """Searches submitted together go out as one msearch, answered in order"""
+    indexer = FakeIndexer()
+    
+    results = run_batched(indexer, ["a", "b", "c"], max_wait_ms=50)
+    
+    assert indexer.batches == [[("a", 10), ("b", 10), ("c", 10)]]
+    assert [hits[0]['file_name'] for hits in results] == ["a.txt", "b.txt", "c.txt"]
+
+
+def test_batcher_splits_at_max_batch():
+    """No msearch carries more than max_batch searches"""
+    indexer = FakeIndexer()
+    
+    results = run_batched(indexer, ["a", "b", "c", "d", "e"], max_batch=2, max_wait_ms=50)
+    
+    assert [len(batch) for batch in indexer.batches] == [2, 2, 1]
+    assert [hits[0]['file_name'] for hits in results] == ["a.txt", "b.txt", "c.txt", "d.txt", "e.txt"]
+
+
+def test_batcher_request_failure_fails_every_caller():
+    """When the msearch request fails, every search in the batch raises"""
+    indexer = FakeIndexer()
+    indexer.error = SearchError("Multi-search failed: connection refused")
+    
+    results = run_batched(indexer, ["a", "b"], max_wait_ms=50)
+    
+    assert all(isinstance(result, SearchError) for result in results)
+
+
+def test_batcher_query_failure_fails_only_its_caller():
+    """A query that failed on its own doesn't fail the rest of its batch"""
+    indexer = FakeIndexer()
+    indexer.failing_queries = {"bad"}
+    
+    bad, good = run_batched(indexer, ["bad", "good"], max_wait_ms=50)
+    
+    assert isinstance(bad, SearchError)
+    assert good[0]['file_name'] == "good.txt"
+
+
+class FakeBatcher:
+    """Stands in for SearchBatcher; set error to simulate an outage"""
+    
+    def __init__(self):
+        self.calls = 0
+        self.error = None
+    
+    async def submit(self, query, limit):
+        self.calls += 1
+        if self.error:
+            raise self.error
+        return [make_result(f"{query}.txt")]
+
+
+@pytest.fixture
+def batcher(monkeypatch) -> FakeBatcher:
+    """Wire the app to a fake batcher with an empty result cache"""
+    batcher = FakeBatcher()
+    monkeypatch.setattr(api, 'indexer', object())
+    monkeypatch.setattr(api, 'batcher', batcher)
+    api.search_cache.clear()
+    yield batcher
+    api.search_cache.clear()
+
+
+@pytest.fixture
+def client() -> TestClient:
+    # Not entered as a context manager: lifespan (the Elasticsearch connect) doesn't run
+    return TestClient(api.app)
+
+
+def test_search_returns_results(batcher, client):
+    """Results come back with cache headers and are served from cache next time"""
+    first = client.get("/search", params={"q": "Report"})
+    second = client.get("/search", params={"q": "report "})
+    
+    assert first.status_code == 200
+    assert [r['file_name'] for r in first.json()['results']] == ["Report.txt"]
+    assert first.headers['cache-control'] == api.SEARCH_CACHE_CONTROL
+    assert second.json()['total_results'] == 1
+    assert batcher.calls == 1
+
+
+def test_search_if_none_match(batcher, client):
+    """The current ETag gets an empty 304; any other ETag gets the full results"""
+    etag = client.get("/search", params={"q": "report"}).headers['etag']
+    
+    not_modified = client.get("/search", params={"q": "report"}, headers={"If-None-Match": etag})
+    changed = client.get("/search", params={"q": "report"}, headers={"If-None-Match": '"0000000000000000"'})
+    
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert not_modified.headers['etag'] == etag
+    assert changed.status_code == 200
+    assert changed.headers['etag'] == etag
+    assert changed.json()['total_results'] == 1
+
+
+def test_search_etag_is_weak_and_shared_by_codings(batcher, client):
+    """Gzip and identity bodies share one ETag, so it must be weak"""
+    params = {"q": "report " + "x" * 2000}  # Long enough for GZipMiddleware
+    gzipped = client.get("/search", params=params, headers={"Accept-Encoding": "gzip"})
+    identity = client.get("/search", params=params, headers={"Accept-Encoding": "identity"})
+    
+    assert gzipped.headers['content-encoding'] == "gzip"
+    assert 'content-encoding' not in identity.headers
+    assert gzipped.headers['etag'] == identity.headers['etag']
+    assert gzipped.headers['etag'].startswith('W/"')
+
+
+@pytest.mark.parametrize("if_none_match, expected", [
+    ('W/"abc"', True),
+    ('"abc"', True),
+    ('"xyz", W/"abc"', True),
+    ('*', True),
+    ('"xyz"', False),
+    (None, False),
+], ids=["weak", "strong", "list", "any", "other", "missing"])
+def test_etag_matches_weakly(if_none_match, expected):
+    """If-None-Match uses weak comparison: the W/ prefix is ignored on either side"""
+    assert api.etag_matches(if_none_match, 'W/"abc"') is expected
+
+
+def test_search_backend_error_is_503_and_not_cached(batcher, client):
+    """An outage is a 503, and recovery isn't hidden behind a cached empty result"""
+    batcher.error = SearchError("Multi-search failed: connection refused")
+    
+    failed = client.get("/search", params={"q": "report"})
+    
+    assert failed.status_code == 503
+    assert 'cache-control' not in failed.headers
+    assert len(api.search_cache) == 0
+    
+    batcher.error = None
+    recovered = client.get("/search", params={"q": "report"})
+    
+    assert recovered.status_code == 200
+    assert recovered.json()['total_results'] == 1
+    assert batcher.calls == 2
+
+
+def test_search_without_elasticsearch_is_503(client, monkeypatch):
+    """Searching before Elasticsearch connected reports the service unavailable"""
+    monkeypatch.setattr(api, 'indexer', None)
+    
+    assert client.get("/search", params={"q": "report"}).status_code == 503
+
+
+@pytest.mark.parametrize("admin_token, headers, status", [
+    ("", {"Authorization": "Bearer anything"}, 403),
+    ("s3cret", {}, 401),
+    ("s3cret", {"Authorization": "Bearer wrong"}, 401),
+    ("s3cret", {"Authorization": "Bearer s3cret"}, 200),
+], ids=["disabled", "missing", "wrong", "valid"])
+def test_cache_invalidate_requires_admin_token(batcher, client, monkeypatch, admin_token, headers, status):
+    """Only the configured admin token may clear the cache"""
+    monkeypatch.setattr(api.settings, 'admin_token', admin_token)
+    client.get("/search", params={"q": "report"})
+    
+    response = client.post("/cache/invalidate", headers=headers)
+    
+    assert response.status_code == status
+    assert len(api.search_cache) == (0 if status == 200 else 1)
+
+
+def test_reindex_requires_admin_token(client, monkeypatch):
+    """Without the admin token no sync is started"""
+    monkeypatch.setattr(api.settings, 'admin_token', "s3cret")
+    started = []
+    monkeypatch.setattr(api, 'run_sync', started.append)
+    
+    response = client.post("/admin/reindex")
+    
+    assert response.status_code == 401
+    assert started == []
+
+
+def test_reindex_failure_clears_running_flag(client, monkeypatch):
+    """A failed sync doesn't leave every later reindex stuck on 409"""
+    monkeypatch.setattr(api.settings, 'admin_token', "s3cret")
+    monkeypatch.setattr(api, 'reindex_running', False)
+    calls = []
+    
+    def failing_sync(incremental):
+        calls.append(incremental)
+        raise RuntimeError("Drive authentication failed")
+    
+    monkeypatch.setattr(api, 'run_sync', failing_sync)
+    headers = {"Authorization": "Bearer s3cret"}
+    
+    # TestClient runs background tasks before returning the response
+    first = client.post("/admin/reindex", headers=headers)
+    second = client.post("/admin/reindex", params={"incremental": "false"}, headers=headers)
+    
+    assert (first.status_code, second.status_code) == (202, 202)
+    assert calls == [True, False]
+    assert api.reindex_running is False
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__]))
@@ -1,74 +1,286 @@
 """
-Test script for Google Drive client.
-Run this to verify OAuth and file listing works.
+Tests for the Google Drive client and content hashing.
+Offline tests use a fake Drive service; the others verify OAuth, file
+listing and download against the configured folder.
+
+Usage:
+    pytest test_drive.py
+    python test_drive.py
 """
+import io
 import sys
+import hashlib
 import logging
-from pathlib import Path
+from datetime import datetime
 
-# Add project root to path
-sys.path.insert(0, str(Path(__file__).parent))
+import pytest
+from googleapiclient.http import DEFAULT_HTTP_TIMEOUT_SEC
 
+from search_service.cloud import base_client
+from search_service.cloud import drive_client as drive_module
+from search_service.cloud.base_client import CloudFile, content_hash
 from search_service.cloud.drive_client import DriveClient
 from search_service.config import settings
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-)
 logger = logging.getLogger(__name__)
 
+# Synced tree for the list_changes tests: folder ID -> path
+FOLDERS = {"root": "", "reports": "Reports"}
+
+
+def drive_item(file_id: str, name: str, parent: str, **fields) -> dict:
+    """A file resource as returned by the Drive API"""
+    return {
+        'id': file_id,
+        'name': name,
+        'mimeType': 'application/pdf',
+        'size': "1024",
+        'webViewLink': f"https://drive.google.com/file/d/{file_id}/view",
+        'modifiedTime': "2024-05-01T10:00:00.000Z",
+        'createdTime': "2024-01-01T10:00:00.000Z",
+        'md5Checksum': f"md5-{file_id}",
+        'parents': [parent],
+        **fields
+    }
+
+
+class FakeRequest:
+    """An API request; execute() returns a canned response or raises"""
+    
+    def __init__(self, response):
+        self.response = response
+    
+    def execute(self, http=None):
+        if isinstance(self.response, Exception):
+            raise self.response
+        return self.response
+
+
+class FakeChangesService:
+    """drive.changes() answering list() from pages keyed by page token"""
+    
+    def __init__(self, pages):
+        self.pages = pages
+        self.page_tokens = []
+    
+    def changes(self):
+        return self
+    
+    def list(self, pageToken, **kwargs):
+        self.page_tokens.append(pageToken)
+        return FakeRequest(self.pages[pageToken])
+
+
+def changes_client(pages) -> DriveClient:
+    """Drive client wired to a fake changes API"""
+    client = DriveClient()
+    client.service = FakeChangesService(pages)
+    return client
+
+
+def test_list_changes_maps_changes_into_tree():
+    """Changes across pages become one change per file, with paths in the synced tree"""
+    client = changes_client({
+        "1": {
+            'nextPageToken': "2",
+            'changes': [
+                {'fileId': "a", 'file': drive_item("a", "draft.pdf", "root")},
+                {'fileId': "b", 'file': drive_item("b", "q1.pdf", "reports")},
+            ]
+        },
+        "2": {
+            'newStartPageToken': "3",
+            'changes': [
+                # Renamed after the first page: the latest change wins
+                {'fileId': "a", 'file': drive_item("a", "final.pdf", "root")},
+                {'fileId': "c", 'removed': True},
+                {'fileId': "d", 'file': drive_item("d", "old.pdf", "reports", trashed=True)},
+                # Moved to a folder outside the synced tree
+                {'fileId': "e", 'file': drive_item("e", "moved.pdf", "elsewhere")},
+            ]
+        }
+    })
+    
+    changes, page_token = client.list_changes("1", FOLDERS)
+    
+    assert page_token == "3"
+    assert client.service.page_tokens == ["1", "2"]
+    by_id = {change.file_id: change.file for change in changes}
+    assert sorted(by_id) == ["a", "b", "c", "d", "e"]
+    assert by_id["a"].path == "final.pdf"
+    assert by_id["b"].path == "Reports/q1.pdf"
+    assert by_id["b"].size == 1024
+    assert by_id["b"].md5_checksum == "md5-b"
+    assert by_id["b"].modified_time == datetime.fromisoformat("2024-05-01T10:00:00+00:00")
+    assert by_id["c"] is None and by_id["d"] is None and by_id["e"] is None
+
+
+@pytest.mark.parametrize("change", [
+    {'fileId': "new", 'file': drive_item("new", "Archive", "root", mimeType=drive_module.FOLDER_MIME_TYPE)},
+    {'fileId': "reports", 'file': drive_item("reports", "Reports 2024", "root", mimeType=drive_module.FOLDER_MIME_TYPE)},
+    {'fileId': "reports", 'removed': True},
+], ids=["folder-added", "folder-renamed", "folder-removed"])
+def test_list_changes_folder_change_needs_full_listing(change):
+    """Folder changes in the synced tree can move paths - ask for a full listing"""
+    client = changes_client({"1": {'newStartPageToken': "2", 'changes': [change]}})
+    
+    assert client.list_changes("1", FOLDERS) is None
+
+
+def test_list_changes_folder_outside_tree_ignored():
+    """Folders elsewhere in the Drive don't force a full listing"""
+    folder = drive_item("other", "Photos", "elsewhere", mimeType=drive_module.FOLDER_MIME_TYPE)
+    client = changes_client({"1": {'newStartPageToken': "2", 'changes': [{'fileId': "other", 'file': folder}]}})
+    
+    assert client.list_changes("1", FOLDERS) == ([], "2")
+
+
+def test_list_changes_api_error_needs_full_listing():
+    """A rejected token or API error falls back to a full listing"""
+    client = changes_client({"1": RuntimeError("Invalid page token")})
+    
+    assert client.list_changes("1", FOLDERS) is None
+
+
+def test_content_hash_bytes_and_file_agree(monkeypatch):
+    """Bytes and files hash the same across chunk boundaries; files are rewound"""
+    monkeypatch.setattr(base_client, 'HASH_CHUNK_SIZE', 7)
+    content = b"The quick brown fox jumps over the lazy dog" * 3
+    fp = io.BytesIO(content)
+    fp.seek(10)
+    
+    digest = content_hash(content)
+    
+    assert digest == hashlib.blake2b(content, digest_size=16).hexdigest()
+    assert content_hash(fp) == digest
+    assert fp.tell() == 0
+    assert content_hash(content + b".") != digest
+
+
+def test_authenticate_non_interactive_fails_fast(monkeypatch, tmp_path):
+    """Without a usable token, non-interactive auth fails instead of opening a browser"""
+    monkeypatch.setattr(settings, 'token_file', str(tmp_path / "token.json"))
+    
+    class NoBrowserFlow:
+        @classmethod
+        def from_client_config(cls, *args, **kwargs):
+            raise AssertionError("OAuth browser flow started")
+    
+    monkeypatch.setattr(drive_module, 'InstalledAppFlow', NoBrowserFlow)
+    client = DriveClient()
+    
+    assert client.authenticate(interactive=False) is False
+    assert client.service is None
+
 
-def main():
-    """Test Drive client"""
-    logger.info("=" * 60)
-    logger.info("Testing Google Drive Client")
-    logger.info("=" * 60)
+def test_thread_http_has_timeout():
+    """Per-thread HTTP objects keep the API client's default socket timeout"""
+    client = DriveClient()
+    
+    http = client._thread_http()
     
-    # Initialize client
+    assert http.http.timeout == DEFAULT_HTTP_TIMEOUT_SEC
+    assert client._thread_http() is http
+
+
+def test_ranged_download_returns_bytes(monkeypatch):
+    """Large files fetched as ranged parts come back as immutable bytes"""
+    monkeypatch.setattr(drive_module, 'PARALLEL_DOWNLOAD_THRESHOLD', 4)
     client = DriveClient()
+    client.service = object()
+    
+    def download_ranged(file_id, size, write):
+        # Parts complete out of order
+        write(5, b"world")
+        write(0, b"hello")
+    
+    monkeypatch.setattr(client, '_download_ranged', download_ranged)
+    
+    content = client.download_file("file-id", 'application/pdf', size=10)
+    
+    assert content == b"helloworld"
+    assert type(content) is bytes
+
+
+def max_pending_downloads(files, content: bytes, **kwargs) -> int:
+    """Run download_many with a fake download_file; return the most downloads pending at once"""
+    client = DriveClient()
+    client.service = object()
+    started = []
+    client.download_file = lambda file_id, mime_type, size: started.append(file_id) or content
+    
+    most_pending = 0
+    consumed = 0
+    for file, downloaded in client.download_many(files, **kwargs):
+        assert downloaded == content
+        most_pending = max(most_pending, len(started) - consumed)
+        consumed += 1
+    
+    assert sorted(started) == sorted(file.file_id for file in files)
+    return most_pending
+
+
+def listed_file(file_id: str, size: int) -> CloudFile:
+    return CloudFile(
+        file_id=file_id, name=f"{file_id}.pdf", path=f"{file_id}.pdf", url="",
+        mime_type='application/vnd.google-apps.document', size=size,
+        modified_time=datetime(2024, 5, 1), created_time=datetime(2024, 5, 1)
+    )
+
+
+def test_download_many_counts_exports_without_size():
+    """Exports list size 0; they count at an estimate instead of not at all"""
+    files = [listed_file(str(i), size=0) for i in range(200)]
+    
+    assert max_pending_downloads(files, b"x" * 50, max_workers=4, max_inflight_bytes=100) == 1
+
+
+def test_download_many_bounds_pending_downloads():
+    """However small the files, only a few downloads per worker are pending"""
+    files = [listed_file(str(i), size=1) for i in range(200)]
+    
+    pending = max_pending_downloads(files, b"x", max_workers=2, max_inflight_bytes=10 ** 9)
+    
+    assert pending <= 2 * drive_module.DOWNLOAD_MANY_MAX_PENDING
+
+
+def test_list_files(drive_files):
+    """List files in the configured folder"""
+    logger.info(f"Listing files in folder: {settings.google_drive_folder_id}")
+    logger.info(f"Found {len(drive_files)} files:\n")
+    
+    for i, file in enumerate(drive_files, 1):
+        logger.info("%d. %s", i, file.name)
+        logger.info("   Path: %s", file.path)
+        logger.info("   Type: %s", file.mime_type)
+        logger.info("   Size: %d bytes", file.size)
+        logger.info("   Modified: %s", file.modified_time)
+        logger.info("   URL: %s", file.url)
+        logger.info("")
+    
+    file_ids = [file.file_id for file in drive_files]
+    assert all(file_ids)
+    assert len(set(file_ids)) == len(file_ids), "A file was listed twice"
+    assert all(file.path.endswith(file.name) for file in drive_files)
+    assert all(file.modified_time.tzinfo is not None for file in drive_files)
+
+
+def test_download_first_file(drive_client, drive_files):
+    """Download the first binary file and check it against the listed size and checksum"""
+    # Workspace documents are exported, so they have no size or checksum to compare
+    binary_files = [file for file in drive_files if file.md5_checksum]
+    if not binary_files:
+        pytest.skip("No binary files in the Drive folder")
+    
+    first_file = binary_files[0]
+    content = drive_client.download_file(first_file.file_id, first_file.mime_type)
     
-    # Step 1: Authenticate
-    logger.info("\n[1] Authenticating with Google Drive...")
-    if not client.authenticate():
-        logger.error("Authentication failed!")
-        return
-    
-    # Step 2: List files
-    logger.info(f"\n[2] Listing files in folder: {settings.google_drive_folder_id}")
-    try:
-        files = client.list_files()
-        
-        logger.info(f"\nFound {len(files)} files:\n")
-        
-        for i, file in enumerate(files, 1):
-            logger.info(f"{i}. {file.name}")
-            logger.info(f"   Path: {file.path}")
-            logger.info(f"   Type: {file.mime_type}")
-            logger.info(f"   Size: {file.size:,} bytes")
-            logger.info(f"   Modified: {file.modified_time}")
-            logger.info(f"   URL: {file.url}")
-            logger.info("")
-        
-        # Step 3: Download first file (if any)
-        if files:
-            logger.info("[3] Testing download of first file...")
-            first_file = files[0]
-            try:
-                content = client.download_file(first_file.file_id)
-                logger.info(f"Downloaded {len(content):,} bytes from {first_file.name}")
-                logger.info(f"First 100 chars: {content[:100]}")
-            except Exception as e:
-                logger.error(f"Download failed: {e}")
-        
-        logger.info("\n" + "=" * 60)
-        logger.info("All tests passed!")
-        logger.info("=" * 60)
-        
-    except Exception as e:
-        logger.error(f"Error: {e}", exc_info=True)
+    logger.info(f"Downloaded {len(content):,} bytes from {first_file.name}")
+    logger.info(f"First 100 chars: {content[:100]}")
+    assert isinstance(content, bytes)
+    assert len(content) == first_file.size
+    assert hashlib.md5(content).hexdigest() == first_file.md5_checksum
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(pytest.main([__file__]))
@@ -1,88 +1,324 @@
 """
-Test script for text extractors.
-Tests extraction from the uploaded Drive files.
+Tests for the text extractors.
+Offline tests cover encoding detection, line normalization, the sample
+files in test_files/, the extracted text cache and concurrent and batched
+OCR (with tesseract faked); test_extract_drive_files extracts text from
+the files uploaded to Drive.
+
+Usage:
+    pytest test_extractors.py
+    python test_extractors.py
 """
+import io
 import sys
 import logging
 from pathlib import Path
 
-sys.path.insert(0, str(Path(__file__).parent))
+import pytest
+from PIL import Image
 
-from search_service.cloud.drive_client import DriveClient
+from search_service.extractor.base_extractor import decode_text, normalize_lines
 from search_service.extractor.extractor_factory import ExtractorFactory
-from search_service.config import settings
+from search_service.extractor.text_extractor import TextExtractor
+from search_service.extractor.csv_extractor import CSVExtractor
+from search_service.extractor import image_extractor as image_module
+from search_service.extractor.image_extractor import ImageExtractor
 
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-)
 logger = logging.getLogger(__name__)
 
+TEST_FILES = Path(__file__).parent / "test_files"
+
+# Long enough for the encoding detector to be trusted
+PORTUGUESE = "São Paulo é uma cidade enorme, com muitas atrações. A população não pára de crescer. " * 3
+RUSSIAN = "Привет, как дела? Это тестовый документ на русском языке для проверки кодировки. " * 3
+
+
+@pytest.mark.parametrize("text, encoding", [
+    ("café", 'latin-1'),
+    ("naïve", 'latin-1'),
+    ("São", 'latin-1'),
+    ("5€ — très", 'cp1252'),
+    (PORTUGUESE, 'cp1252'),
+], ids=["latin1-cafe", "latin1-naive", "latin1-sao", "cp1252-euro", "cp1252-long"])
+def test_decode_western_text(text, encoding):
+    """Short or ambiguous Western text is not mis-detected as another code page"""
+    decoded, _ = decode_text(text.encode(encoding))
+    assert decoded == text
+
+
+def test_decode_utf8():
+    """UTF-8 is decoded without guessing"""
+    assert decode_text("naïve".encode('utf-8')) == ("naïve", 'utf-8')
+
+
+def test_decode_detected_encoding():
+    """A confident guess for a non-Western code page is used"""
+    decoded, encoding = decode_text(RUSSIAN.encode('cp1251'))
+    assert decoded == RUSSIAN
+    assert encoding == 'cp1251'
+
+
+def test_decode_bytes_undefined_in_cp1252():
+    """Bytes cp1252 can't decode fall back to latin-1"""
+    assert decode_text(b"a\x81b") == ("a\x81b", 'latin-1')
+
+
+def test_text_extractor_latin1():
+    """Text files that aren't UTF-8 are decoded, then stripped"""
+    content = "  Le café est très bon.\n".encode('latin-1')
+    assert TextExtractor().extract_text(content, "notes.txt") == "Le café est très bon."
+
+
+def test_csv_extractor_latin1():
+    """CSV files that aren't UTF-8 are decoded before parsing"""
+    content = "name,place\nAna,café\n".encode('latin-1')
+    assert CSVExtractor().extract_text(content, "people.csv") == "Headers: name, place\nRow 1: Ana | café"
+
+
+def test_csv_extractor_rows():
+    """Rows become "Row N: ..." lines; empty cells and rows are dropped"""
+    content = b"a,b,c\r\n1,,3\r\n\r\nx,\"multi\nline\",z\r\n"
+    assert CSVExtractor().extract_text(content, "t.csv") == (
+        "Headers: a, b, c\n"
+        "Row 1: 1 | 3\n"
+        "Row 3: x | multi\nline | z"
+    )
+
 
-def main():
-    """Test extractors with real Drive files"""
-    logger.info("=" * 60)
-    logger.info("Testing Text Extractors")
-    logger.info("=" * 60)
+def test_csv_extractor_unicode_line_separators():
+    """Characters str.splitlines() breaks on stay inside their field"""
+    content = "a,b\n3,4\x85z\n5,6\u2028w\n".encode('utf-8')
+    assert CSVExtractor().extract_text(content, "t.csv") == (
+        "Headers: a, b\n"
+        "Row 1: 3 | 4\x85z\n"
+        "Row 2: 5 | 6\u2028w"
+    )
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("  first  \n\n\t second line\t\n \n\n third ", "first\nsecond line\nthird"),
+    ("a  b\r\n\r\nc", "a  b\nc"),
+    ("\n\n  \n", ""),
+], ids=["blank-lines", "crlf", "only-whitespace"])
+def test_normalize_lines(text, expected):
+    """Lines are stripped and blank lines dropped; spacing inside a line is kept"""
+    assert normalize_lines(text) == expected
+
+
+@pytest.mark.parametrize("filename, mime_type, expected_start, expected_line", [
+    ("sample.txt", 'text/plain',
+     "Document Search Service Test File",
+     "Python, FastAPI, Elasticsearch, Google Drive API"),
+    ("employee_data.csv", 'text/csv',
+     "Headers: employee_id, name, department, salary, location, hire_date",
+     "Row 1: E001 | Alice Johnson | Engineering | 95000 | San Francisco | 2024-01-15"),
+    ("inventory.csv", 'text/csv',
+     "Headers: product_id, product_name, category, price, stock, supplier",
+     "Row 1: P001 | Laptop Pro 15 | Electronics | 1299.99 | 45 | TechSupply Co"),
+], ids=["sample.txt", "employee_data.csv", "inventory.csv"])
+def test_extract_sample_files(filename, mime_type, expected_start, expected_line):
+    """The factory picks the right extractor and returns the expected text"""
+    factory = ExtractorFactory(include_ocr=False)
+    content = (TEST_FILES / filename).read_bytes()
+    
+    text = factory.extract_text(content, mime_type, filename)
+    
+    assert text.startswith(expected_start)
+    assert expected_line in text.splitlines()
+
+
+def test_extract_sample_file_from_file_object():
+    """Spooled downloads (open files) extract the same as bytes"""
+    factory = ExtractorFactory(include_ocr=False)
+    path = TEST_FILES / "employee_data.csv"
     
-    # Initialize Drive client
-    client = DriveClient()
+    with open(path, 'rb') as f:
+        from_file = factory.extract_text(f, 'text/csv', path.name)
     
-    # Authenticate
-    logger.info("\n[1] Authenticating with Google Drive...")
-    if not client.authenticate():
-        logger.error("Authentication failed!")
-        return
+    assert from_file == factory.extract_text(path.read_bytes(), 'text/csv', path.name)
+
+
+@pytest.mark.parametrize("mime_type, filename, expected", [
+    ('text/csv', "notes.txt", CSVExtractor),
+    ('text/plain', "data.csv", TextExtractor),
+    ('application/octet-stream', "data.CSV", CSVExtractor),
+    ('application/octet-stream', "archive.zip", type(None)),
+], ids=["mime-over-txt", "mime-over-csv", "extension-fallback", "unsupported"])
+def test_extractor_lookup_prefers_mime_type(mime_type, filename, expected):
+    """A known MIME type decides the extractor; the extension is only a fallback"""
+    assert type(ExtractorFactory().resolve(mime_type, filename)) is expected
+
+
+def counting_extractor(factory: ExtractorFactory, monkeypatch, mime_type: str, filename: str) -> list:
+    """Record each file the resolved extractor actually parses"""
+    extractor = factory.resolve(mime_type, filename)
+    parse = extractor.extract_text
+    calls = []
     
-    # List files
-    logger.info(f"\n[2] Listing files in folder: {settings.google_drive_folder_id}")
-    files = client.list_files()
-    logger.info(f"Found {len(files)} files\n")
+    def extract_text(content, filename):
+        calls.append(filename)
+        return parse(content, filename)
     
-    # Initialize extractor factory
-    extractor_factory = ExtractorFactory(include_ocr=False)
+    monkeypatch.setattr(extractor, 'extract_text', extract_text)
+    return calls
+
+
+def test_extract_cache_hit_skips_parsing(tmp_path, monkeypatch):
+    """A miss parses and stores the text; the same content is then served from cache"""
+    factory = ExtractorFactory(cache_dir=str(tmp_path))
+    calls = counting_extractor(factory, monkeypatch, 'text/plain', "notes.txt")
     
-    # Test extraction on each file
-    logger.info("[3] Testing text extraction...\n")
+    first = factory.extract_text(b"a,b\n1,2\n", 'text/plain', "notes.txt")
+    second = factory.extract_text(b"a,b\n1,2\n", 'text/plain', "renamed.txt")
     
-    for i, file in enumerate(files, 1):
-        logger.info(f"\n{'='*60}")
-        logger.info(f"File {i}/{len(files)}: {file.name}")
-        logger.info(f"{'='*60}")
-        logger.info(f"Type: {file.mime_type}")
-        logger.info(f"Size: {file.size:,} bytes")
+    assert first == second == "a,b\n1,2"
+    assert calls == ["notes.txt"]
+    assert len(factory.cache) == 1
+
+
+def test_extract_cache_keyed_by_extractor(tmp_path):
+    """The same bytes read as text and as CSV don't share a cache entry"""
+    factory = ExtractorFactory(cache_dir=str(tmp_path))
+    content = b"a,b\n1,2\n"
+    
+    as_text = factory.extract_text(content, 'text/plain', "notes.txt")
+    as_csv = factory.extract_text(content, 'text/csv', "notes.csv")
+    
+    assert as_text == "a,b\n1,2"
+    assert as_csv == "Headers: a, b\nRow 1: 1 | 2"
+    assert factory.extract_text(content, 'text/plain', "notes.txt") == as_text
+
+
+class FailingCache:
+    """A cache whose disk has gone away"""
+    
+    def get(self, key):
+        raise OSError("disk I/O error")
+    
+    def set(self, key, value):
+        raise OSError("disk I/O error")
+
+
+def test_extract_cache_failure_is_a_miss(monkeypatch):
+    """Cache read and write errors fall back to parsing, not a failed extraction"""
+    factory = ExtractorFactory()
+    factory.cache = FailingCache()
+    calls = counting_extractor(factory, monkeypatch, 'text/plain', "notes.txt")
+    
+    assert factory.extract_text(b"hello", 'text/plain', "notes.txt") == "hello"
+    assert factory.extract_text(b"hello", 'text/plain', "notes.txt") == "hello"
+    assert calls == ["notes.txt", "notes.txt"]
+
+
+def png(width: int, height: int) -> bytes:
+    """A blank PNG; its size tells OCR results apart"""
+    buffer = io.BytesIO()
+    Image.new('RGB', (width, height), 'white').save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def ocr_extractor(monkeypatch) -> ImageExtractor:
+    """Image extractor that doesn't need tesseract installed"""
+    monkeypatch.setattr(image_module.pytesseract, 'get_tesseract_version', lambda: "5.3.0")
+    extractor = ImageExtractor()
+    assert extractor.available
+    return extractor
+
+
+def ocr_list_file(list_path: str, config: str) -> str:
+    """Fake tesseract run on a list file: one form-feed-terminated page per image"""
+    with open(list_path, encoding='utf-8') as list_file:
+        paths = list_file.read().split()
+    pages = []
+    for path in paths:
+        with Image.open(path) as image:
+            pages.append(f"  image {image.width}x{image.height}  \n\n")
+    return "\f".join(pages) + "\f"
+
+
+def test_extract_text_batch_maps_pages_to_images(ocr_extractor, monkeypatch):
+    """Pages come back in input order; unreadable images get "" and no page"""
+    monkeypatch.setattr(image_module.pytesseract, 'image_to_string', ocr_list_file)
+    items = [(png(3, 1), "a.png"), (b"not an image", "bad.png"), (png(1, 2), "b.png")]
+    
+    assert ocr_extractor.extract_text_batch(items) == ["image 3x1", "", "image 1x2"]
+
+
+def test_extract_text_batch_too_few_pages(ocr_extractor, monkeypatch):
+    """Output that can't be matched to the images is an error, not shifted text"""
+    monkeypatch.setattr(image_module.pytesseract, 'image_to_string', lambda path, config: "only one\f")
+    
+    with pytest.raises(ValueError, match="1 pages for 2 images"):
+        ocr_extractor.extract_text_batch([(png(1, 1), "a.png"), (png(2, 2), "b.png")])
+
+
+def test_extract_text_many_keeps_order(ocr_extractor, monkeypatch):
+    """Concurrent OCR returns results in input order; a failed image gives """""
+    def ocr_image(image, config):
+        if image.width == 2:
+            raise RuntimeError("tesseract crashed")
+        return f"image {image.width}x{image.height}\n"
+    
+    monkeypatch.setattr(image_module.pytesseract, 'image_to_string', ocr_image)
+    items = [(png(width, 1), f"{width}.png") for width in (5, 2, 1, 4, 3)]
+    items.insert(1, (b"not an image", "bad.png"))
+    
+    assert ocr_extractor.extract_text_many(items, max_workers=4) == [
+        "image 5x1", "", "", "image 1x1", "image 4x1", "image 3x1"
+    ]
+
+
+def test_extract_drive_files(drive_client, drive_files, extractor_factory):
+    """Download every supported Drive file and extract its text"""
+    # Check support up front so only supported files are downloaded
+    supported = []
+    for file in drive_files:
+        if extractor_factory.is_supported(file.mime_type, file.name):
+            supported.append(file)
+        else:
+            logger.warning("%s: file type not supported, skipping", file.name)
+    
+    if not supported:
+        pytest.skip("No supported files in the Drive folder")
+    
+    failed = []
+    extracted = 0
+    
+    # Downloads run concurrently; files arrive in completion order
+    for i, (file, content) in enumerate(drive_client.download_many(supported), 1):
+        logger.info("\n" + "=" * 60)
+        logger.info("File %d/%d: %s", i, len(supported), file.name)
+        logger.info("=" * 60)
+        logger.info("Type: %s", file.mime_type)
+        logger.info("Size: %d bytes", file.size)
         
-        # Check if supported
-        if not extractor_factory.is_supported(file.mime_type, file.name):
-            logger.warning(f"File type not supported, skipping")
+        if content is None:
+            logger.error("Download failed")
+            failed.append(file.name)
             continue
         
-        try:
-            # Download file
-            logger.info("Downloading...")
-            content = client.download_file(file.file_id)
-            
-            # Extract text
-            logger.info("Extracting text...")
-            text = extractor_factory.extract_text(content, file.mime_type, file.name)
-            
-            if text:
-                logger.info(f"Extracted {len(text)} characters")
-                logger.info(f"\nFirst 200 chars:\n{'-'*60}")
-                logger.info(text[:200])
-                if len(text) > 200:
-                    logger.info("...")
-                logger.info(f"{'-'*60}")
-            else:
-                logger.warning("No text extracted")
-                
-        except Exception as e:
-            logger.error(f"Error: {e}")
-    
-    logger.info("\n" + "=" * 60)
-    logger.info("Extraction tests complete!")
-    logger.info("=" * 60)
+        # Extract text
+        logger.info("Extracting text...")
+        text = extractor_factory.extract_text(content, file.mime_type, file.name)
+        
+        if text is None:
+            # Already logged by the factory
+            failed.append(file.name)
+        elif text:
+            extracted += 1
+            logger.info("Extracted %d characters", len(text))
+            logger.info("\nFirst 200 chars:\n" + "-" * 60)
+            logger.info(text[:200])
+            if len(text) > 200:
+                logger.info("...")
+            logger.info("-" * 60)
+        else:
+            logger.warning("No text extracted")
+    
+    assert not failed, f"Download or extraction failed for: {', '.join(failed)}"
+    assert extracted, "No text extracted from any supported file"
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(pytest.main([__file__]))
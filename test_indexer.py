@@ -1,150 +1,226 @@
 """
-Test script for Elasticsearch indexer.
-Downloads files from Drive, extracts text, and indexes in Elasticsearch.
+Tests for the Elasticsearch indexer.
+Offline tests run against a fake Elasticsearch client; test_index_drive_files
+and test_search download files from Drive, index them, then search.
+
+Usage:
+    pytest test_indexer.py
+    python test_indexer.py
 """
 import sys
 import logging
-from pathlib import Path
+from datetime import datetime, timezone
 
-sys.path.insert(0, str(Path(__file__).parent))
+import pytest
 
-from search_service.cloud.drive_client import DriveClient
-from search_service.extractor.extractor_factory import ExtractorFactory
-from search_service.indexer.elastic_indexer import ElasticIndexer
-from search_service.config import settings
+from search_service.indexer.elastic_indexer import ElasticIndexer, SearchError
+from search_service.indexer.orjson_serializer import orjson_serializers
 
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-)
 logger = logging.getLogger(__name__)
 
+SEARCH_QUERIES = [
+    "engineering",
+    "search",
+    "API",
+    "laptop"
+]
 
-def main():
-    """Test complete indexing pipeline"""
-    logger.info("=" * 60)
-    logger.info("Testing Elasticsearch Indexer")
-    logger.info("=" * 60)
+
+def make_hit(file_name: str, score: float) -> dict:
+    """A search hit as returned by Elasticsearch"""
+    return {
+        '_score': score,
+        '_source': {
+            'file_id': file_name,
+            'file_name': file_name,
+            'file_path': f"/{file_name}",
+            'url': f"https://drive.google.com/{file_name}",
+            'mime_type': 'text/plain',
+            'updated_time': "2024-01-01T00:00:00+00:00"
+        },
+        'highlight': {'extracted_text': [f"<em>{file_name}</em>"]}
+    }
+
+
+class FakeSearchClient:
+    """Elasticsearch client stub: answers msearch with canned responses"""
     
-    # Step 1: Connect to Elasticsearch
-    logger.info("\n[1] Connecting to Elasticsearch...")
+    def __init__(self, responses=None, error=None):
+        self.responses = responses
+        self.error = error
+        self.searches = []
+    
+    def msearch(self, searches):
+        self.searches.append(searches)
+        if self.error:
+            raise self.error
+        return {'responses': self.responses}
+
+
+def offline_indexer(client: FakeSearchClient) -> ElasticIndexer:
+    """Indexer wired to a fake client instead of a live cluster"""
     indexer = ElasticIndexer()
-    if not indexer.connect():
-        logger.error("Failed to connect to Elasticsearch")
-        logger.error("Make sure Elasticsearch is running: docker-compose up -d")
-        return
-    
-    # Step 2: Create index
-    logger.info("\n[2] Creating search index...")
-    if not indexer.create_index():
-        logger.error("Failed to create index")
-        return
-    
-    # Step 3: Authenticate with Drive
-    logger.info("\n[3] Authenticating with Google Drive...")
-    drive_client = DriveClient()
-    if not drive_client.authenticate():
-        logger.error("Authentication failed")
-        return
-    
-    # Step 4: List files
-    logger.info(f"\n[4] Listing files from folder: {settings.google_drive_folder_id}")
-    files = drive_client.list_files()
-    logger.info(f"Found {len(files)} files")
-    
-    if not files:
-        logger.warning("No files to index!")
-        return
-    
-    # Step 5: Extract and index
-    logger.info("\n[5] Extracting text and indexing documents...\n")
-    extractor_factory = ExtractorFactory()
+    indexer.client = client
+    return indexer
+
+
+def test_multi_search_results_in_query_order():
+    """One msearch request, one formatted result list per query"""
+    client = FakeSearchClient(responses=[
+        {'hits': {'hits': [make_hit("a.txt", 2.5)]}},
+        {'hits': {'hits': []}}
+    ])
+    
+    results = offline_indexer(client).multi_search([("alpha", 5), ("nothing", 3)])
+    
+    assert len(client.searches) == 1
+    assert [body['size'] for body in client.searches[0][1::2]] == [5, 3]
+    assert results[1] == []
+    assert results[0] == [{
+        'score': 2.5,
+        'file_id': "a.txt",
+        'file_name': "a.txt",
+        'file_path': "/a.txt",
+        'url': "https://drive.google.com/a.txt",
+        'mime_type': 'text/plain',
+        'updated_time': "2024-01-01T00:00:00+00:00",
+        'highlights': ["<em>a.txt</em>"]
+    }]
+
+
+def test_multi_search_request_failure_raises():
+    """A failed msearch request raises instead of looking like no results"""
+    indexer = offline_indexer(FakeSearchClient(error=ConnectionError("connection refused")))
+    
+    with pytest.raises(SearchError, match="connection refused"):
+        indexer.multi_search([("alpha", 5)])
+
+
+def test_multi_search_query_failure_returned_per_query():
+    """A query that fails on its own doesn't fail the rest of the batch"""
+    client = FakeSearchClient(responses=[
+        {'error': {'type': 'search_phase_execution_exception', 'reason': "all shards failed"}},
+        {'hits': {'hits': [make_hit("b.txt", 1.0)]}},
+        {'error': {'type': 'index_not_found_exception', 'reason': "no such index"}}
+    ])
+    
+    failed, found, missing_index = offline_indexer(client).multi_search(
+        [("bad", 5), ("beta", 5), ("gamma", 5)]
+    )
+    
+    assert isinstance(failed, SearchError)
+    assert "all shards failed" in str(failed)
+    assert [hit['file_name'] for hit in found] == ["b.txt"]
+    assert missing_index == []
+
+
+def test_orjson_ndjson_serializer():
+    """Bulk bodies: one orjson line per action, datetimes as ISO strings"""
+    serializer = orjson_serializers()['application/x-ndjson']
+    
+    body = serializer.dumps([
+        {"index": {"_id": "a"}},
+        {"file_name": "café.txt", "updated_time": datetime(2024, 1, 1, tzinfo=timezone.utc)}
+    ])
+    
+    assert body == (
+        b'{"index":{"_id":"a"}}\n'
+        b'{"file_name":"caf\xc3\xa9.txt","updated_time":"2024-01-01T00:00:00+00:00"}\n'
+    )
+    assert serializer.loads(body)[1]['file_name'] == "café.txt"
+
+
+def test_index_drive_files(drive_client, drive_files, extractor_factory, indexer):
+    """Extract and index every supported Drive file"""
+    if not drive_files:
+        pytest.skip("No files to index")
     
     indexed_count = 0
     skipped_count = 0
+    failed = []
     
-    for i, file in enumerate(files, 1):
-        logger.info(f"\n[{i}/{len(files)}] Processing: {file.name}")
+    # Check support up front so only supported files are downloaded
+    supported = []
+    for file in drive_files:
+        if extractor_factory.is_supported(file.mime_type, file.name):
+            supported.append(file)
+        else:
+            logger.warning("%s: unsupported file type, skipping", file.name)
+            skipped_count += 1
+    
+    # Downloads run concurrently; files arrive in completion order
+    for i, (file, content) in enumerate(drive_client.download_many(supported), 1):
+        logger.info("\n[%d/%d] Processing: %s", i, len(supported), file.name)
+        
+        if content is None:
+            logger.error("  Download failed")
+            failed.append(file.name)
+            continue
+        
+        # Extract text
+        logger.info("  Extracting text...")
+        text = extractor_factory.extract_text(content, file.mime_type, file.name)
         
-        # Check if supported
-        if not extractor_factory.is_supported(file.mime_type, file.name):
-            logger.warning(f"Unsupported file type, skipping")
+        if not text:
+            logger.warning("  No text extracted, skipping")
             skipped_count += 1
             continue
         
-        try:
-            # Download file
-            logger.info("  Downloading...")
-            content = drive_client.download_file(file.file_id)
-            
-            # Extract text
-            logger.info("  Extracting text...")
-            text = extractor_factory.extract_text(content, file.mime_type, file.name)
-            
-            if not text:
-                logger.warning("  No text extracted, skipping")
-                skipped_count += 1
-                continue
-            
-            # Prepare document
-            document = {
-                'file_id': file.file_id,
-                'file_name': file.name,
-                'file_path': file.path,
-                'url': file.url,
-                'mime_type': file.mime_type,
-                'extracted_text': text,
-                'updated_time': file.modified_time.isoformat(),
-                'size': file.size
-            }
-            
-            # Index document
-            logger.info("  Indexing...")
-            if indexer.index_document(document):
-                logger.info(f"  Indexed successfully ({len(text)} chars)")
-                indexed_count += 1
-            else:
-                logger.error("  Indexing failed")
-                
-        except Exception as e:
-            logger.error(f"  Error: {e}")
-    
-    # Step 6: Test search
+        # Prepare document
+        document = {
+            'file_id': file.file_id,
+            'file_name': file.name,
+            'file_path': file.path,
+            'url': file.url,
+            'mime_type': file.mime_type,
+            'extracted_text': text,
+            'updated_time': file.modified_time,
+            'size': file.size
+        }
+        
+        # Index document
+        logger.info("  Indexing...")
+        if indexer.index_document(document):
+            logger.info("  Indexed successfully (%d chars)", len(text))
+            indexed_count += 1
+        else:
+            logger.error("  Indexing failed")
+            failed.append(file.name)
+    
     logger.info("\n" + "=" * 60)
-    logger.info(f"Indexing complete!")
+    logger.info("Indexing complete!")
     logger.info(f"  Indexed: {indexed_count}")
     logger.info(f"  Skipped: {skipped_count}")
     logger.info("=" * 60)
     
-    if indexed_count > 0:
-        logger.info("\n[6] Testing search functionality...\n")
-        
-        # Test searches
-        test_queries = [
-            "engineering",
-            "search",
-            "API",
-            "laptop"
-        ]
-        
-        for query in test_queries:
-            logger.info(f"\nSearch: '{query}'")
-            logger.info("-" * 40)
-            results = indexer.search(query, limit=3)
-            
-            if results:
-                for i, result in enumerate(results, 1):
-                    logger.info(f"{i}. {result['file_name']} (score: {result['score']:.2f})")
-                    logger.info(f"   Path: {result['file_path']}")
-                    if 'highlights' in result and result['highlights']:
-                        logger.info(f"   Match: ...{result['highlights'][0]}...")
-            else:
-                logger.info("  No results found")
+    assert not failed, f"Download or indexing failed for: {', '.join(failed)}"
+
+
+@pytest.mark.parametrize("query", SEARCH_QUERIES)
+def test_search(indexer, query):
+    """Search the documents indexed above"""
+    if not indexer.count_documents():
+        pytest.skip("Nothing indexed")
     
-    logger.info("\n" + "=" * 60)
-    logger.info("All tests complete!")
-    logger.info("=" * 60)
+    logger.info(f"\nSearch: '{query}'")
+    logger.info("-" * 40)
+    results = indexer.search(query, limit=3)
+    
+    if results:
+        for i, result in enumerate(results, 1):
+            logger.info(f"{i}. {result['file_name']} (score: {result['score']:.2f})")
+            logger.info(f"   Path: {result['file_path']}")
+            if 'highlights' in result and result['highlights']:
+                logger.info(f"   Match: ...{result['highlights'][0]}...")
+    else:
+        logger.info("  No results found")
+    
+    assert len(results) <= 3
+    scores = [result['score'] for result in results]
+    assert scores == sorted(scores, reverse=True)
+    for result in results:
+        assert result['file_id'] and result['file_name'] and result['url']
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(pytest.main([__file__]))
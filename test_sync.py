@@ -0,0 +1,392 @@
+"""
+Tests for the sync pipeline (search_service.main).
+Run offline: Drive and Elasticsearch are replaced by in-memory fakes.
+
+Usage:
+    pytest test_sync.py
+    python test_sync.py
+"""
+import sys
+import json
+import threading
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import nullcontext
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+from search_service import main
+from search_service.cloud.base_client import CloudFile, FileChange
+from search_service.main import DocumentIndexer
+
+MODIFIED = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def make_file(
+    file_id: str,
+    name: str,
+    path: Optional[str] = None,
+    modified_time: datetime = MODIFIED,
+    md5_checksum: Optional[str] = None
+) -> CloudFile:
+    """A plain-text Drive file"""
+    return CloudFile(
+        file_id=file_id,
+        name=name,
+        path=path or f"/{name}",
+        url=f"https://drive.google.com/file/d/{file_id}/view",
+        mime_type='text/plain',
+        size=0,
+        modified_time=modified_time,
+        created_time=MODIFIED,
+        md5_checksum=md5_checksum
+    )
+
+
+class FakeDrive:
+    """In-memory Drive folder: files, their content and a changes feed"""
+    
+    def __init__(self):
+        self.files: Dict[str, CloudFile] = {}
+        self.contents: Dict[str, bytes] = {}
+        self.changes: List[FileChange] = []
+        self.changes_valid = True
+        self.changes_listed = 0
+        self.downloaded: List[str] = []
+    
+    def add(self, file: CloudFile, content: Optional[bytes]):
+        """Add or replace a file (None content: its download fails)"""
+        self.files[file.file_id] = file
+        self.contents[file.file_id] = content
+        self.changes.append(FileChange(file.file_id, file))
+    
+    def remove(self, file_id: str):
+        """Delete a file"""
+        del self.files[file_id]
+        self.changes.append(FileChange(file_id, None))
+    
+    def list_files(self, folder_id=None, folders=None):
+        if folders is not None:
+            folders['root'] = ""
+        return iter(list(self.files.values()))
+    
+    def get_start_page_token(self) -> str:
+        return str(len(self.changes))
+    
+    def list_changes(self, page_token, folders):
+        self.changes_listed += 1
+        # None is what DriveClient returns when a full listing is needed
+        if not self.changes_valid:
+            return None
+        return self.changes[int(page_token):], self.get_start_page_token()
+    
+    def download_many(self, files, max_workers=None, spool_threshold=None):
+        for file in files:
+            self.downloaded.append(file.file_id)
+            yield file, self.contents[file.file_id]
+
+
+class FakeIndexer:
+    """In-memory index with the ElasticIndexer methods the sync uses"""
+    
+    def __init__(self):
+        self.docs: Dict[str, Dict[str, Any]] = {}
+    
+    def bulk_mode(self):
+        return nullcontext()
+    
+    def get_all_document_ids(self) -> List[str]:
+        return list(self.docs)
+    
+    def count_documents(self) -> int:
+        return len(self.docs)
+    
+    def documents_exist(self, file_ids):
+        return {file_id: file_id in self.docs for file_id in file_ids}
+    
+    def mget_sync_state(self, file_ids):
+        return {
+            file_id: {
+                'updated_time': self.docs[file_id]['updated_time'],
+                'file_name': self.docs[file_id]['file_name'],
+                'file_path': self.docs[file_id]['file_path'],
+                'content_hash': self.docs[file_id]['content_hash'],
+                'md5_checksum': self.docs[file_id]['md5_checksum']
+            }
+            for file_id in file_ids if file_id in self.docs
+        }
+    
+    def bulk_index_documents(self, documents, chunk_size=None, max_chunk_bytes=None):
+        for document in documents:
+            self.docs[document['file_id']] = dict(document)
+        return []
+    
+    def bulk_update_metadata(self, updates):
+        for file_id, fields in updates.items():
+            self.docs[file_id].update(fields)
+        return len(updates)
+    
+    def bulk_delete(self, file_ids):
+        file_ids = [file_id for file_id in file_ids if file_id in self.docs]
+        for file_id in file_ids:
+            del self.docs[file_id]
+        return len(file_ids)
+    
+    def refresh_index(self) -> bool:
+        return True
+    
+    def force_merge(self) -> bool:
+        return True
+
+
+@pytest.fixture(autouse=True)
+def offline_settings(monkeypatch, tmp_path):
+    """Keep sync state and the extraction cache out of the working tree"""
+    monkeypatch.setattr(main.settings, 'sync_state_file', str(tmp_path / "sync_state.json"))
+    monkeypatch.setattr(main.settings, 'extract_cache_dir', "")
+    # Threads instead of processes: same extract_in_worker calls, faster startup
+    monkeypatch.setattr(
+        DocumentIndexer, '_extract_pool',
+        lambda self, max_workers: ThreadPoolExecutor(max_workers=max_workers)
+    )
+
+
+@pytest.fixture
+def drive() -> FakeDrive:
+    return FakeDrive()
+
+
+@pytest.fixture
+def index() -> FakeIndexer:
+    return FakeIndexer()
+
+
+def run_sync(drive: FakeDrive, index: FakeIndexer, incremental: bool = True) -> DocumentIndexer:
+    """Run one sync against the fakes and return it (for its stats)"""
+    indexer = DocumentIndexer(incremental=incremental, workers=2)
+    indexer.drive_client = drive
+    indexer.indexer = index
+    indexer.sync()
+    return indexer
+
+
+def test_full_sync_indexes_files(drive, index):
+    """Every supported file is indexed with its text and metadata"""
+    drive.add(make_file("a", "a.txt"), b"alpha")
+    drive.add(make_file("b", "b.txt"), b"beta")
+    
+    stats = run_sync(drive, index, incremental=False).stats
+    
+    assert stats['indexed'] == 2
+    assert index.docs["a"]['extracted_text'] == "alpha"
+    assert index.docs["b"]['file_path'] == "/b.txt"
+
+
+@pytest.mark.parametrize("md5_checksum", ["0123abcd", None], ids=["md5", "content-hash"])
+@pytest.mark.parametrize("changes_feed", [True, False], ids=["changes", "listing"])
+def test_rename_with_same_content_updates_metadata(drive, index, md5_checksum, changes_feed):
+    """A renamed/moved file with unchanged bytes gets its new name and path indexed"""
+    drive.add(make_file("a", "f0.txt", md5_checksum=md5_checksum), b"same text")
+    run_sync(drive, index, incremental=False)
+    if not changes_feed:
+        Path(main.settings.sync_state_file).unlink()
+    
+    renamed = make_file(
+        "a", "renamed.txt", path="/archive/renamed.txt",
+        modified_time=MODIFIED + timedelta(days=1), md5_checksum=md5_checksum
+    )
+    drive.add(renamed, b"same text")
+    drive.downloaded.clear()
+    stats = run_sync(drive, index).stats
+    
+    assert stats['skipped'] == 1
+    assert index.docs["a"]['file_name'] == "renamed.txt"
+    assert index.docs["a"]['file_path'] == "/archive/renamed.txt"
+    assert index.docs["a"]['updated_time'] == renamed.modified_time
+    assert index.docs["a"]['extracted_text'] == "same text"
+    # With a Drive checksum the file isn't even downloaded
+    assert drive.downloaded == ([] if md5_checksum else ["a"])
+
+
+@pytest.mark.parametrize("changes_feed", [True, False], ids=["changes", "listing"])
+def test_rename_keeping_modified_time_updates_metadata(drive, index, changes_feed):
+    """Renames don't change modifiedTime - they must not be skipped as up to date"""
+    drive.add(make_file("a", "f0.txt"), b"same text")
+    run_sync(drive, index, incremental=False)
+    if not changes_feed:
+        Path(main.settings.sync_state_file).unlink()
+    
+    drive.add(make_file("a", "renamed.txt"), b"same text")
+    run_sync(drive, index)
+    
+    assert index.docs["a"]['file_name'] == "renamed.txt"
+    assert index.docs["a"]['file_path'] == "/renamed.txt"
+
+
+def test_unmodified_file_skipped_without_download(drive, index):
+    """Files with the indexed modified time, name and path aren't downloaded"""
+    drive.add(make_file("a", "a.txt"), b"alpha")
+    run_sync(drive, index, incremental=False)
+    Path(main.settings.sync_state_file).unlink()
+    drive.downloaded.clear()
+    
+    stats = run_sync(drive, index).stats
+    
+    assert stats['skipped'] == 1
+    assert drive.downloaded == []
+
+
+def test_changes_feed_indexes_only_changes(drive, index):
+    """An incremental sync processes only files changed since the saved token"""
+    drive.add(make_file("a", "a.txt"), b"alpha")
+    drive.add(make_file("b", "b.txt"), b"beta")
+    run_sync(drive, index, incremental=False)
+    
+    drive.add(make_file("c", "c.txt"), b"gamma")
+    drive.add(make_file("b", "b.txt", modified_time=MODIFIED + timedelta(days=1)), b"beta 2")
+    drive.remove("a")
+    drive.downloaded.clear()
+    sync = run_sync(drive, index)
+    
+    assert drive.changes_listed == 1
+    assert sync.stats['total_files'] == 2
+    assert sync.stats['indexed'] == 1
+    assert sync.stats['updated'] == 1
+    assert sync.stats['deleted'] == 1
+    assert sorted(drive.downloaded) == ["b", "c"]
+    assert sorted(index.docs) == ["b", "c"]
+    assert index.docs["b"]['extracted_text'] == "beta 2"
+    assert json.loads(Path(main.settings.sync_state_file).read_text())['page_token'] == "5"
+
+
+def test_changes_feed_unusable_falls_back_to_full_listing(drive, index):
+    """When the feed can't be used, deletions are found from a full listing"""
+    drive.add(make_file("a", "a.txt"), b"alpha")
+    run_sync(drive, index, incremental=False)
+    
+    drive.remove("a")
+    drive.changes_valid = False
+    sync = run_sync(drive, index)
+    
+    assert sync.stats['deleted'] == 1
+    assert index.docs == {}
+
+
+def test_change_token_kept_after_errors(drive, index):
+    """A sync with errors doesn't advance the token, so failed files are retried"""
+    drive.add(make_file("a", "a.txt"), b"alpha")
+    run_sync(drive, index, incremental=False)
+    
+    drive.add(make_file("b", "b.txt"), None)
+    sync = run_sync(drive, index)
+    assert sync.stats['errors'] == 1
+    assert json.loads(Path(main.settings.sync_state_file).read_text())['page_token'] == "1"
+    
+    drive.add(make_file("b", "b.txt"), b"beta")
+    run_sync(drive, index)
+    assert index.docs["b"]['extracted_text'] == "beta"
+    assert json.loads(Path(main.settings.sync_state_file).read_text())['page_token'] == "3"
+
+
+def test_sync_state_for_other_folder_ignored(drive, index, monkeypatch):
+    """A token saved for a different Drive folder forces a full listing"""
+    drive.add(make_file("a", "a.txt"), b"alpha")
+    run_sync(drive, index, incremental=False)
+    
+    monkeypatch.setattr(main.settings, 'google_drive_folder_id', "other-folder")
+    drive.remove("a")
+    sync = run_sync(drive, index)
+    
+    assert drive.changes_listed == 0
+    assert sync.stats['deleted'] == 1
+    state = json.loads(Path(main.settings.sync_state_file).read_text())
+    assert state['folder_id'] == "other-folder"
+
+
+@pytest.mark.parametrize("missing", ["page_token", "folders"])
+def test_incomplete_sync_state_falls_back_to_full_listing(drive, index, missing):
+    """A truncated or hand-edited state file means a full listing, not a failed sync"""
+    drive.add(make_file("a", "a.txt"), b"alpha")
+    run_sync(drive, index, incremental=False)
+    
+    path = Path(main.settings.sync_state_file)
+    state = json.loads(path.read_text())
+    del state[missing]
+    path.write_text(json.dumps(state))
+    drive.remove("a")
+    sync = run_sync(drive, index)
+    
+    assert drive.changes_listed == 0
+    assert sync.stats['errors'] == 0
+    assert sync.stats['deleted'] == 1
+    assert json.loads(path.read_text())['page_token'] == "2"
+
+
+class CrashingPool(ThreadPoolExecutor):
+    """Extraction pool that is broken from the start, like one whose worker crashed"""
+    
+    def submit(self, *args, **kwargs):
+        raise BrokenProcessPool("A process in the process pool was terminated abruptly")
+
+
+def test_extraction_pool_restarted_after_crash(drive, index, monkeypatch):
+    """A crashed extraction pool is replaced and the sync carries on"""
+    pools = []
+    
+    def extract_pool(self, max_workers):
+        # The first pool is broken, its replacement works
+        pools.append((CrashingPool if not pools else ThreadPoolExecutor)(max_workers=max_workers))
+        return pools[-1]
+    
+    monkeypatch.setattr(DocumentIndexer, '_extract_pool', extract_pool)
+    drive.add(make_file("a", "a.txt"), b"alpha")
+    drive.add(make_file("b", "b.txt"), b"beta")
+    
+    stats = run_sync(drive, index, incremental=False).stats
+    
+    assert len(pools) == 2
+    assert stats['indexed'] == 2
+    assert stats['errors'] == 0
+
+
+def test_extraction_pool_crashing_repeatedly_counts_files_as_errors(drive, index, monkeypatch):
+    """When restarts don't help, the sync stops and every unprocessed file is an error"""
+    monkeypatch.setattr(
+        DocumentIndexer, '_extract_pool',
+        lambda self, max_workers: CrashingPool(max_workers=max_workers)
+    )
+    for i in range(5):
+        drive.add(make_file(f"f{i}", f"f{i}.txt"), b"text")
+    
+    stats = run_sync(drive, index, incremental=False).stats
+    
+    assert stats['errors'] == 5
+    assert stats['indexed'] == 0
+    assert index.docs == {}
+    # Errors keep the change token from being saved
+    assert not Path(main.settings.sync_state_file).exists()
+
+
+def test_index_stage_failure_stops_downloader(drive, index, monkeypatch):
+    """If indexing fails, the download thread is stopped instead of blocking on the full queue"""
+    monkeypatch.setattr(main, 'PIPELINE_QUEUE_SIZE', 2)
+    
+    def failing_index_stage(self, extracted, indexed_file_ids):
+        extracted.get()
+        raise RuntimeError("Elasticsearch went away")
+    
+    monkeypatch.setattr(DocumentIndexer, '_index_stage', failing_index_stage)
+    for i in range(20):
+        drive.add(make_file(f"f{i}", f"f{i}.txt"), b"text")
+    
+    run_sync(drive, index, incremental=False)
+    
+    assert not any(thread.name == "sync-download" for thread in threading.enumerate())
+    assert len(drive.downloaded) < 20
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__]))